@@ -0,0 +1,96 @@
+import threading
+from utils import run_mediapipe_detection, landmarks_to_pixels
+
+class BaseDetector:
+    DISPLAY_NAME = "Detector"
+    # result attribute holding one landmark list per object, for detectors drawn from landmarks
+    LANDMARKS_FIELD = None
+
+    def __init__(self, config):
+        self.enabled = False
+        self.detector = None
+        self.model_path = config["model_path"]
+        self.draw_config = config["draw"]
+        self.running_mode = config.get("running_mode", "image")
+        inference_size = config.get("inference_size")
+        self.inference_size = (inference_size["width"], inference_size["height"]) if inference_size else None
+        self.remapped_result = None
+        self.latest_result = None
+        self.last_timestamp_ms = -1
+        self._model_lock = threading.Lock()
+        self._points_cache = (None, None, [])
+
+    def _init_detector(self):
+        raise NotImplementedError
+
+    @property
+    def is_loaded(self):
+        return self.detector is not None
+
+    def load(self):
+        with self._model_lock:
+            if self.detector is None:
+                self._init_detector()
+        return self.detector is not None
+
+    def unload(self):
+        with self._model_lock:
+            if self.detector is not None:
+                self.detector.close()
+                self.detector = None
+        self.latest_result = None
+        self.last_timestamp_ms = -1
+
+    def reload(self):
+        self.unload()
+        return self.load()
+
+    def enable(self):
+        if not self.load():
+            print(f"{self.DISPLAY_NAME} cannot be enabled (model missing/failed to load)")
+            return
+        self.enabled = True
+        print(f"{self.DISPLAY_NAME} enabled")
+
+    def disable(self):
+        self.enabled = False
+        self.latest_result = None
+        print(f"{self.DISPLAY_NAME} disabled")
+
+    def warm_up(self, mp_image):
+        # the first inference initializes the task graph; run it on a blank image before the detector goes live
+        with self._model_lock:
+            if self.detector is None or self.last_timestamp_ms >= 0:
+                return False
+            run_mediapipe_detection(self.detector, mp_image, self.running_mode, 0)
+            self.last_timestamp_ms = 0
+        self.latest_result = None
+        return True
+
+    def _result_points(self, detection_result, frame_size):
+        # results are reused across frames by the cadence scheduler, so convert each one only once
+        cached_result, cached_size, points = self._points_cache
+        if cached_result is not detection_result or cached_size != frame_size:
+            landmark_lists = getattr(detection_result, self.LANDMARKS_FIELD)
+            points = [landmarks_to_pixels(landmarks, frame_size) for landmarks in landmark_lists]
+            self._points_cache = (detection_result, frame_size, points)
+        return points
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        self.latest_result = result
+
+    def detect(self, mp_image, timestamp_ms=0):
+        if not self.enabled or mp_image is None or self.detector is None:
+            return None
+
+        # video/live_stream tasks reject timestamps that don't strictly increase
+        timestamp_ms = max(int(timestamp_ms), self.last_timestamp_ms + 1)
+        self.last_timestamp_ms = timestamp_ms
+
+        with self._model_lock:
+            if self.detector is None:
+                return None
+            result = run_mediapipe_detection(self.detector, mp_image, self.running_mode, timestamp_ms)
+        if self.running_mode == "live_stream":
+            return self.latest_result
+        return result
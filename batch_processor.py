@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import cv2
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from config import CONFIG
+from detector_registry import create_detector
+from frame_packet import FramePacket
+
+def collect_jobs(inputs, image_extensions=None):
+    if image_extensions is None:
+        image_extensions = CONFIG["batch"]["image_extensions"]
+    image_extensions = tuple(ext.lower() for ext in image_extensions)
+
+    jobs = []
+    for path in inputs:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            images = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(image_extensions)
+            )
+            if images:
+                jobs.append({"name": os.path.basename(path.rstrip(os.sep)), "type": "images", "paths": images})
+            else:
+                print(f"[Batch Warning] No images found in: {path}")
+        elif os.path.isfile(path):
+            jobs.append({"name": os.path.splitext(os.path.basename(path))[0], "type": "video", "paths": [path]})
+        else:
+            print(f"[Batch Warning] Input isn't exists: {path}")
+    return jobs
+
+def _iter_frames(job):
+    if job["type"] == "images":
+        for i, image_path in enumerate(job["paths"]):
+            frame = cv2.imread(image_path)
+            if frame is None:
+                print(f"[Batch Warning] Failed to read image: {image_path}")
+                continue
+            yield i, 0.0, frame
+        return
+
+    cap = cv2.VideoCapture(job["paths"][0])
+    if not cap.isOpened():
+        print(f"[Batch Error] Failed to open video: {job['paths'][0]}")
+        return
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_index = 0
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame_index, frame_index / fps, frame
+            frame_index += 1
+    finally:
+        cap.release()
+
+def _create_detectors(detector_ids, running_mode):
+    detectors = {}
+    for detector_id in detector_ids:
+        detector_config = CONFIG["detection_controller"]["detectors"][detector_id]
+        detector = create_detector(detector_config["class"])
+        # offline input has no live stream, image folders are independent stills
+        detector.running_mode = running_mode
+        detector.enable()
+        if detector.enabled:
+            detectors[detector_id] = detector
+    return detectors
+
+def _to_json(arrays):
+    return {key: value.tolist() for key, value in arrays.items()}
+
+def process_job(job, output_dir, output_format="jsonl", annotate=False, detector_ids=None):
+    if detector_ids is None:
+        detector_ids = CONFIG["batch"]["detectors"]
+    running_mode = "image" if job["type"] == "images" else "video"
+    detectors = _create_detectors(detector_ids, running_mode)
+    if not detectors:
+        return {"name": job["name"], "frames": 0, "error": "no detector could be loaded"}
+
+    os.makedirs(output_dir, exist_ok=True)
+    jsonl_file = None
+    if output_format == "jsonl":
+        jsonl_file = open(os.path.join(output_dir, f"{job['name']}.jsonl"), "w", encoding="utf-8")
+    npz_arrays = {}
+    writer = None
+
+    start_time = time.perf_counter()
+    frame_count = 0
+    try:
+        for frame_index, timestamp, frame in _iter_frames(job):
+            packet = FramePacket(frame, timestamp, frame_index)
+            for detector_id, detector in detectors.items():
+                packet.results[detector_id] = packet.detect(detector)
+
+            record = {"frame": frame_index, "timestamp_ms": packet.timestamp_ms}
+            if job["type"] == "images":
+                record["source"] = os.path.basename(job["paths"][frame_index])
+            for detector_id, detector in detectors.items():
+                arrays = detector.to_arrays(packet.results[detector_id])
+                if jsonl_file is not None:
+                    record[detector.RESULT_KEY] = _to_json(arrays)
+                else:
+                    for key, value in arrays.items():
+                        name = f"{detector.RESULT_KEY}_{key}"
+                        npz_arrays.setdefault(name, []).append(value)
+                        npz_arrays.setdefault(f"{name}_frame", []).append(
+                            np.full(len(value), frame_index, dtype=np.int32)
+                        )
+
+            if jsonl_file is not None:
+                jsonl_file.write(json.dumps(record) + "\n")
+
+            if annotate:
+                if writer is None:
+                    height, width = frame.shape[:2]
+                    writer = cv2.VideoWriter(
+                        os.path.join(output_dir, f"{job['name']}_annotated.mp4"),
+                        cv2.VideoWriter_fourcc(*"mp4v"),
+                        CONFIG["batch"]["annotate_fps"],
+                        (width, height)
+                    )
+                annotated = frame
+                for detector_id, detector in detectors.items():
+                    annotated = detector.draw(annotated, packet.results[detector_id])
+                writer.write(annotated)
+
+            frame_count += 1
+    finally:
+        if jsonl_file is not None:
+            jsonl_file.close()
+        if writer is not None:
+            writer.release()
+        for detector in detectors.values():
+            detector.unload()
+
+    if output_format == "npz":
+        np.savez_compressed(
+            os.path.join(output_dir, f"{job['name']}.npz"),
+            **{name: np.concatenate(chunks) for name, chunks in npz_arrays.items()}
+        )
+
+    elapsed = time.perf_counter() - start_time
+    return {"name": job["name"], "frames": frame_count, "seconds": elapsed}
+
+def run_batch(inputs, output_dir=None, output_format=None, annotate=None, workers=None, detector_ids=None):
+    batch_config = CONFIG["batch"]
+    output_dir = output_dir or batch_config["output_dir"]
+    output_format = output_format or batch_config["format"]
+    annotate = batch_config["annotate"] if annotate is None else annotate
+    workers = workers or batch_config["workers"] or os.cpu_count() or 1
+    detector_ids = detector_ids or batch_config["detectors"]
+
+    if output_format not in ("jsonl", "npz"):
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    jobs = collect_jobs(inputs)
+    if not jobs:
+        print("[Batch Error] Nothing to process")
+        return []
+
+    workers = min(workers, len(jobs))
+    print(f"Processing {len(jobs)} input(s) with {workers} worker process(es)...")
+    summaries = []
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(process_job, job, output_dir, output_format, annotate, detector_ids): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                summary = {"name": job["name"], "frames": 0, "error": str(e)}
+            summaries.append(summary)
+            if "error" in summary:
+                print(f"[Batch Error] {summary['name']}: {summary['error']}")
+            else:
+                fps = summary["frames"] / summary["seconds"] if summary["seconds"] > 0 else 0.0
+                print(f"  {summary['name']}: {summary['frames']} frames, {fps:.1f} FPS")
+
+    total_frames = sum(summary["frames"] for summary in summaries)
+    elapsed = time.perf_counter() - start_time
+    print(f"Batch finished: {total_frames} frames in {elapsed:.1f}s ({total_frames / max(elapsed, 1e-9):.1f} FPS total)")
+    return summaries
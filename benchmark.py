@@ -0,0 +1,248 @@
+import os
+import sys
+import json
+import argparse
+import platform
+import cv2
+import numpy as np
+from config import CONFIG
+from detection_controller import DetectionController
+from frame_scheduler import FrameScheduler
+from stage_timer import StageTimer
+from recording import ReplaySource, read_header
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Benchmark")
+
+class SyntheticSource:
+    def __init__(self, width, height, max_frames, seed=0, display=False):
+        self.resolution = {"width": width, "height": height}
+        self.max_frames = max_frames
+        self.seed = seed
+        self.display = display
+        self.window_name = "Benchmark"
+        self.is_running = False
+        self.frame_seq = 0
+        self._background = None
+
+    def start(self):
+        rng = np.random.default_rng(self.seed)
+        height, width = self.resolution["height"], self.resolution["width"]
+        self._background = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        self.frame_seq = 0
+        self.is_running = True
+
+    def stop(self):
+        self.is_running = False
+        if self.display:
+            cv2.destroyWindow(self.window_name)
+
+    def _render(self, index):
+        frame = self._background.copy()
+        height, width = frame.shape[:2]
+        # a bright disc and bar sweeping across the frame so every frame differs deterministically
+        x = int((index * 7) % width)
+        y = int(height / 2 + np.sin(index / 10) * height / 4)
+        cv2.circle(frame, (x, y), max(height // 8, 4), (220, 200, 180), -1)
+        cv2.rectangle(frame, (width - x - 20, height // 4), (width - x, height * 3 // 4), (40, 160, 40), -1)
+        return frame
+
+    def get_latest(self, timeout=None):
+        if not self.is_running or self.frame_seq >= self.max_frames:
+            self.is_running = False
+            return None, None, None
+        frame = self._render(self.frame_seq)
+        self.frame_seq += 1
+        return frame, self.frame_seq / 30.0, self.frame_seq
+
+    def get_frame(self):
+        return self.get_latest()[0]
+
+    def show_frame(self, frame):
+        if self.display and frame is not None:
+            cv2.imshow(self.window_name, frame)
+            cv2.waitKey(1)
+
+class ClipSource(SyntheticSource):
+    def __init__(self, clip_path, width, height, max_frames, display=False):
+        super().__init__(width, height, max_frames, display=display)
+        self.clip_path = clip_path
+        self.cap = None
+
+    def start(self):
+        self.cap = cv2.VideoCapture(self.clip_path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Failed to open benchmark clip: {self.clip_path}")
+        self.frame_seq = 0
+        self.is_running = True
+
+    def stop(self):
+        super().stop()
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def get_latest(self, timeout=None):
+        if not self.is_running or self.frame_seq >= self.max_frames:
+            self.is_running = False
+            return None, None, None
+
+        ret, frame = self.cap.read()
+        if not ret:
+            # loop the clip so every run sees the same number of frames
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+            if not ret:
+                self.is_running = False
+                return None, None, None
+
+        height, width = self.resolution["height"], self.resolution["width"]
+        if frame.shape[:2] != (height, width):
+            frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_LINEAR)
+        self.frame_seq += 1
+        return frame, self.frame_seq / 30.0, self.frame_seq
+
+def ensure_clip(clip_path, num_frames=90, width=640, height=480):
+    if os.path.exists(clip_path):
+        return clip_path
+
+    os.makedirs(os.path.dirname(clip_path), exist_ok=True)
+    source = SyntheticSource(width, height, num_frames, seed=1)
+    source.start()
+    writer = cv2.VideoWriter(clip_path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (width, height))
+    for index in range(num_frames):
+        writer.write(source._render(index))
+    writer.release()
+    print(f"[Benchmark Info] Generated benchmark clip: {clip_path}")
+    return clip_path
+
+def parse_resolution(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+def run_case(controller, source, warmup_frames):
+    if warmup_frames:
+        warmup_limit = source.max_frames
+        source.max_frames = warmup_frames
+        _drive(controller, source)
+        source.max_frames = warmup_limit
+
+    previous_timer = controller.stage_timer
+    controller.stage_timer = StageTimer()
+    _drive(controller, source)
+    summary = controller.stage_timer.summary()
+    controller.stage_timer = previous_timer
+    return summary
+
+def _drive(controller, source):
+    source.start()
+    controller.camera = source
+    controller.last_results.clear()
+    controller.is_running = True
+    controller._draw_loop()
+    controller.is_running = False
+    source.stop()
+
+def run_benchmark(args):
+    controller = DetectionController()
+    controller.scheduler = FrameScheduler(0)
+    controller.start_executor()
+    for detector_id in args.detectors:
+        controller.toggle_detector("enable", detector_id)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "frames": args.frames,
+            "detectors": args.detectors,
+            "execution_mode": controller.execution_mode
+        },
+        "cases": {}
+    }
+
+    clip_path = ensure_clip(args.clip) if "clip" in args.sources else None
+    for source_name in args.sources:
+        if source_name == "replay":
+            width, height = read_header(args.replay)[:2]
+            case_name = f"replay_{width}x{height}"
+            print(f"[Benchmark Info] Running {case_name} ({args.frames} frames)...")
+            source = ReplaySource(args.replay, realtime=False, loop=True, max_frames=args.frames)
+            results["cases"][case_name] = run_case(controller, source, args.warmup)
+            continue
+
+        for resolution in args.resolutions:
+            width, height = parse_resolution(resolution)
+            if source_name == "synthetic":
+                source = SyntheticSource(width, height, args.frames, display=args.display)
+            else:
+                source = ClipSource(clip_path, width, height, args.frames, display=args.display)
+
+            case_name = f"{source_name}_{width}x{height}"
+            print(f"[Benchmark Info] Running {case_name} ({args.frames} frames)...")
+            results["cases"][case_name] = run_case(controller, source, args.warmup)
+
+    for detector_id in args.detectors:
+        controller.toggle_detector("disable", detector_id)
+    controller.stop_executor()
+    controller.model_manager.unload_all()
+    return results
+
+def compare_results(current, baseline, threshold):
+    regressions = []
+    for case_name, stages in current["cases"].items():
+        baseline_stages = baseline.get("cases", {}).get(case_name)
+        if baseline_stages is None:
+            continue
+        for stage, stats in stages.items():
+            if stage not in baseline_stages:
+                continue
+            for key in ("p50_ms", "p95_ms", "p99_ms"):
+                old, new = baseline_stages[stage][key], stats[key]
+                if old > 0 and new > old * (1 + threshold):
+                    regressions.append((case_name, stage, key, old, new))
+    return regressions
+
+def print_results(results):
+    for case_name, stages in results["cases"].items():
+        print(f"\n{case_name}")
+        print(f"  {'stage':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for stage, stats in stages.items():
+            print(f"  {stage:<22}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Detection pipeline benchmark")
+    parser.add_argument("--frames", type=int, default=200, help="measured frames per case")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured frames before each case")
+    parser.add_argument("--resolutions", nargs="+", default=["640x480", "1280x720"])
+    parser.add_argument("--sources", nargs="+", choices=["synthetic", "clip", "replay"], default=["synthetic", "clip"])
+    parser.add_argument("--clip", default=os.path.join(BENCHMARK_DIR, "bench_clip.avi"),
+                        help="short clip used by the clip source, generated if missing")
+    parser.add_argument("--replay", help="recording used by the replay source (recorded resolution, max speed)")
+    parser.add_argument("--detectors", type=int, nargs="+",
+                        default=[int(k) for k in CONFIG["detection_controller"]["detectors"]])
+    parser.add_argument("--display", action="store_true", help="show frames with cv2.imshow (needs a desktop)")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a saved result file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown ratio before a regression")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_benchmark(args)
+    print_results(results)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}:")
+            for case_name, stage, key, old, new in regressions:
+                print(f"  {case_name} {stage} {key}: {old:.2f} -> {new:.2f} ms (+{(new / old - 1) * 100:.0f}%)")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.compare} (threshold {args.threshold:.0%})")
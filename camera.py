@@ -1,6 +1,10 @@
+import os
 import cv2
 import time
+import threading
+from collections import deque
 from config import CONFIG
+from frame_pool import FramePool
 
 class Camera:
     def __init__(self, camera_index=None, window_name=None):
@@ -11,6 +15,27 @@ class Camera:
         self.exit_key = CONFIG["camera"]["exit_key"]
         self.resolution = CONFIG["camera"]["resolution"]
         self.fps = CONFIG["camera"]["fps"]
+        # device indices are ints, video files / stream URLs are strings
+        self.is_file_source = isinstance(self.camera_index, str) and os.path.isfile(self.camera_index)
+        self.threaded_capture = CONFIG["camera"].get("threaded_capture", True)
+        self.buffer_size = CONFIG["camera"].get("buffer_size", 2)
+
+        self.grab_thread = None
+        self._buffer = deque(maxlen=self.buffer_size)
+        self._frame_ready = threading.Condition()
+        self.frame_seq = 0
+        self.last_read_seq = 0
+        self.dropped_frames = 0
+        # capture buffers: the frames queued for the reader, the one it is reading, and the one being written
+        self.frame_pool = FramePool("capture")
+        self.pool_slots = self.buffer_size + 2
+        self.frame_shape = None
+
+        self.record_config = CONFIG["camera"].get("record", {})
+        self.recorder = None
+
+        self.display = CONFIG["camera"].get("display", "window")
+        self.preview_server = None
 
     def start(self):
         self.cap = cv2.VideoCapture(self.camera_index)
@@ -23,22 +48,138 @@ class Camera:
         self.cap.set(cv2.CAP_PROP_FPS, self.fps)
         
         self.is_running = True
+        self._start_display()
+
+        if self.record_config.get("enabled", False):
+            from recording import FrameRecorder
+            self.recorder = FrameRecorder(self.record_config["path"], fps=self.fps)
+
+        if self.threaded_capture:
+            # keep the driver queue short, the grabber thread holds the newest frames itself
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self._buffer.clear()
+            self.frame_seq = 0
+            self.last_read_seq = 0
+            self.dropped_frames = 0
+            self.grab_thread = threading.Thread(target=self._grab_loop, daemon=True)
+            self.grab_thread.start()
+
         print(f"Camera (index: {self.camera_index}) started successfully")
 
     def stop(self):
         self.is_running = False
+
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+        if self.grab_thread is not None and self.grab_thread.is_alive():
+            self.grab_thread.join(timeout=1.0)
+        self.grab_thread = None
         
         if self.cap is not None and self.cap.isOpened():
             self.cap.release()
+
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
         
-        cv2.destroyWindow(self.window_name)
+        self._stop_display()
+        if self.threaded_capture:
+            print(f"Camera dropped {self.dropped_frames} of {self.frame_seq} captured frames")
+        print(self.frame_pool.report())
         print("Camera stopped and resources released")
 
+    def _start_display(self):
+        if self.display == "mjpeg" and self.preview_server is None:
+            from mjpeg_server import MJPEGServer
+            mjpeg_config = CONFIG["camera"]["mjpeg"]
+            self.preview_server = MJPEGServer(mjpeg_config["host"], mjpeg_config["port"], mjpeg_config["quality"])
+            self.preview_server.start()
+
+    def _stop_display(self):
+        if self.preview_server is not None:
+            self.preview_server.stop()
+            self.preview_server = None
+        if self.display == "window":
+            cv2.destroyWindow(self.window_name)
+
+    def _read(self):
+        ret, frame = self._read_into_pool()
+        if not ret and self.is_file_source:
+            # loop recorded files so they behave like an endless camera
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._read_into_pool()
+        return ret, frame
+
+    def _read_into_pool(self):
+        if self.frame_shape is None:
+            ret, frame = self.cap.read()
+        else:
+            # decodes straight into a pooled buffer; OpenCV hands back a new array if the size changed
+            ret, frame = self.cap.read(self.frame_pool.acquire("capture", self.frame_shape, self.pool_slots))
+        if ret:
+            self.frame_shape = frame.shape
+        return ret, frame
+
+    def _grab_loop(self):
+        next_read = time.monotonic()
+        while self.is_running and self.cap is not None and self.cap.isOpened():
+            if self.is_file_source:
+                # files decode faster than real time, pace them like the camera they stand in for
+                next_read += 1.0 / self.fps
+                time.sleep(max(next_read - time.monotonic(), 0))
+
+            ret, frame = self._read()
+            if not ret:
+                time.sleep(0.005)
+                continue
+
+            timestamp = time.monotonic()
+            if self.recorder is not None:
+                self.recorder.append(frame, timestamp, self.frame_seq + 1)
+            with self._frame_ready:
+                self.frame_seq += 1
+                self._buffer.append((frame, timestamp, self.frame_seq))
+                self._frame_ready.notify_all()
+
+    def get_latest(self, timeout=None):
+        if not self.threaded_capture:
+            frame = self.get_frame()
+            if frame is None:
+                return None, None, None
+            self.frame_seq += 1
+            self.last_read_seq = self.frame_seq
+            timestamp = time.monotonic()
+            if self.recorder is not None:
+                self.recorder.append(frame, timestamp, self.frame_seq)
+            return frame, timestamp, self.frame_seq
+
+        if not self.is_running:
+            return None, None, None
+
+        if timeout is None:
+            timeout = 2.0 / self.fps
+
+        with self._frame_ready:
+            if not self._buffer or self._buffer[-1][2] <= self.last_read_seq:
+                self._frame_ready.wait(timeout)
+            if not self._buffer or self._buffer[-1][2] <= self.last_read_seq:
+                return None, None, None
+
+            frame, timestamp, seq = self._buffer[-1]
+            # every frame captured since the last read that we skip over is a dropped frame
+            self.dropped_frames += seq - self.last_read_seq - 1
+            self.last_read_seq = seq
+            return frame, timestamp, seq
+
     def get_frame(self):
+        if self.threaded_capture:
+            frame, timestamp, seq = self.get_latest()
+            return frame
+
         if not self.is_running or self.cap is None or not self.cap.isOpened():
             return None
         
-        ret, frame = self.cap.read()
+        ret, frame = self._read()
         
         if not ret:
             return None
@@ -48,6 +189,13 @@ class Camera:
     def show_frame(self, frame):
         if not self.is_running or frame is None:
             return
+
+        if self.display == "mjpeg":
+            if self.preview_server is not None:
+                self.preview_server.submit_frame(frame)
+            return
+        if self.display != "window":
+            return
         
         cv2.imshow(self.window_name, frame)
         
@@ -1,5 +1,6 @@
 import yaml
 import os
+import numpy as np
 from typing import Dict, Any
 
 CONFIG: Dict[str, Any] = {}
@@ -17,6 +18,7 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
         CONFIG = yaml.safe_load(f)
     
     _complete_model_paths()
+    _compile_draw_config()
     
     return CONFIG
 
@@ -35,4 +37,33 @@ def _complete_model_paths():
         rel_path = CONFIG["human_stickman_detection"]["model_path"]
         CONFIG["human_stickman_detection"]["model_path"] = os.path.join(current_dir, rel_path)
 
+    quality = CONFIG.get("detection_controller", {}).get("quality", {})
+    for step in quality.get("ladder", []):
+        if "model_path" in step:
+            step["model_path"] = os.path.join(current_dir, step["model_path"])
+
+def _to_color_tuples(section):
+    for key, value in section.items():
+        if isinstance(value, dict):
+            _to_color_tuples(value)
+        elif key.endswith("color") and isinstance(value, list):
+            section[key] = tuple(value)
+
+def _compile_draw_config():
+    # connection lists become (M, 2) index arrays and colors become tuples once, not on every frame
+    for section_name, connections_key in (
+        ("hand_gesture_detection", "hand_connections"),
+        ("human_stickman_detection", "pose_connections")
+    ):
+        section = CONFIG.get(section_name, {})
+        if connections_key in section:
+            section[connections_key] = np.asarray(section[connections_key], dtype=np.int32).reshape(-1, 2)
+
+    for section_name in ("face_detection", "hand_gesture_detection", "human_stickman_detection"):
+        if "draw" in CONFIG.get(section_name, {}):
+            _to_color_tuples(CONFIG[section_name]["draw"])
+    tracking = CONFIG.get("detection_controller", {}).get("tracking", {})
+    if "text" in tracking:
+        _to_color_tuples(tracking["text"])
+
 load_config()
\ No newline at end of file
@@ -0,0 +1,107 @@
+import os
+import asyncio
+import threading
+
+# every response ends with this line, so a line-based client knows where multi-line output stops
+END_OF_RESPONSE = "END"
+
+class ControlServer:
+    def __init__(self, controller, socket_path, command_timeout=5.0):
+        self.controller = controller
+        self.socket_path = socket_path
+        self.command_timeout = command_timeout
+        self.loop = None
+        self.thread = None
+        self._stopped = None
+        self._clients = set()
+
+    def start(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.loop is None:
+            return
+        if self._stopped is not None:
+            self.loop.call_soon_threadsafe(self._stopped.set)
+        self.thread.join(timeout=2.0)
+        self.loop = None
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._serve())
+        except OSError as e:
+            print(f"[Control Error] Failed to start control server on {self.socket_path}: {e}")
+        finally:
+            self.loop.close()
+
+    async def _serve(self):
+        self._stopped = asyncio.Event()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        print(f"[Control Info] Accepting commands on {self.socket_path}")
+        try:
+            await self._stopped.wait()
+        finally:
+            server.close()
+            # connected clients are still waiting on readline(); end them before the loop closes
+            clients = list(self._clients)
+            for task in clients:
+                task.cancel()
+            await asyncio.gather(*clients, return_exceptions=True)
+            await server.wait_closed()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def _handle_client(self, reader, writer):
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self._execute(line.decode("utf-8", errors="replace"))
+                writer.write(f"{response.rstrip()}\n{END_OF_RESPONSE}\n".encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            # cancelled by _serve on shutdown; finishing normally keeps asyncio's stream callback quiet
+            pass
+        finally:
+            self._clients.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _execute(self, cmd):
+        parsed = self.controller.parse_command(cmd)
+        if not parsed:
+            return f"ERROR {self.controller.invalid_cmd_msg}"
+
+        action, detector_id = parsed
+        if action == "exit":
+            self.controller.request_exit()
+            return "OK exiting"
+        if action == "status":
+            return self.controller.status_text()
+        if action == "metrics":
+            return self.controller.metrics_text()
+
+        # model loading / warm-up is blocking, keep it off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.controller.prepare_command, action, detector_id)
+        # detector changes are applied by the draw thread between frames; wait for that here
+        future = self.controller.submit_command(action, detector_id)
+        try:
+            status = await asyncio.wait_for(asyncio.wrap_future(future), self.command_timeout)
+        except asyncio.TimeoutError:
+            return "ERROR command not applied in time"
+        except Exception as e:
+            return f"ERROR {e}"
+        return f"OK {status}"
@@ -1,39 +1,190 @@
 import time
+import numpy as np
+import queue
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from camera import Camera
-from face_detection import FaceDetection
-from hand_gesture_detection import HandGestureDetection
-from human_stickman_detection import HumanStickmanDetection
 from config import CONFIG
-from utils import flip_frame
+from detector_registry import create_detector
+from model_manager import ModelManager
+from frame_packet import FramePacket
+from frame_pool import FramePool
+from frame_scheduler import FrameScheduler
+from metrics import Metrics
+from roi_cascade import PoseCascade
+from motion_gate import MotionGate
+from quality_controller import QualityController
+from overlay_layer import OverlayLayer
+from tracker import ObjectTracker, TRACKED_ARRAYS, track_anchors, draw_track_ids
+from gesture_classifier import GestureClassifier, GESTURE_NAMES, NONE, WRIST
+from shm_transport import ProcessDetectorPool
+from result_publisher import ResultPublisher
+from control_server import ControlServer
+from utils import flip_frame, draw_text_labels
 
 class DetectionController:
-    def __init__(self):
+    def __init__(self, camera=None, started_at=None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.first_frame_shown = False
         camera_config = CONFIG["camera"]
-        self.camera = Camera(
+        self.camera = camera if camera is not None else Camera(
             camera_index=camera_config["index"],
             window_name=camera_config["window_name"]
         )
 
         self.detectors = {
-            int(k): (v["name"], eval(v["class"])()) 
+            int(k): (v["name"], create_detector(v["class"]))
             for k, v in CONFIG["detection_controller"]["detectors"].items()
         }
+        self.cadences = {
+            int(k): v.get("cadence", 1)
+            for k, v in CONFIG["detection_controller"]["detectors"].items()
+        }
+        self.last_results = {}
+        self.frame_pool = FramePool("processing")
+
+        self.motion_gate = None
+        gate_config = CONFIG["detection_controller"].get("motion_gate", {})
+        if gate_config.get("enabled", False):
+            self.motion_gate = MotionGate(
+                downsample_size=(gate_config["downsample"]["width"], gate_config["downsample"]["height"]),
+                pixel_threshold=gate_config["pixel_threshold"],
+                changed_ratio=gate_config["changed_ratio"],
+                max_stale_frames=gate_config["max_stale_frames"]
+            )
+
+        self.publisher = None
+        publisher_config = CONFIG.get("publisher", {})
+        if publisher_config.get("enabled", False):
+            self.publisher = ResultPublisher(
+                publisher_config["socket_path"],
+                max_queue=publisher_config["max_queue"],
+                batch_size=publisher_config["batch_size"]
+            )
+
+        self.trackers = {}
+        self.track_inputs = {}
+        self.tracking_config = CONFIG["detection_controller"].get("tracking", {})
+        if self.tracking_config.get("enabled", False):
+            for idx, (name, detector) in self.detectors.items():
+                metric = TRACKED_ARRAYS[detector.RESULT_KEY][1]
+                max_cost = self.tracking_config["max_iou_cost" if metric == "iou" else "max_keypoint_distance"]
+                self.trackers[idx] = ObjectTracker(
+                    detector.RESULT_KEY,
+                    max_cost,
+                    max_missed=self.tracking_config["max_missed"],
+                    velocity_smoothing=self.tracking_config["velocity_smoothing"]
+                )
+
+        self.gesture_classifiers = {}
+        self.gesture_inputs = {}
+        gesture_config = CONFIG["hand_gesture_detection"].get("gestures", {})
+        if gesture_config.get("enabled", False):
+            for idx, (name, detector) in self.detectors.items():
+                if detector.RESULT_KEY == "hand":
+                    self.gesture_classifiers[idx] = GestureClassifier(
+                        max_hands=detector.num_hands,
+                        history=gesture_config["history"],
+                        straight_cos=gesture_config["straight_cos"],
+                        swipe_frames=gesture_config["swipe_frames"],
+                        swipe_distance=gesture_config["swipe_distance"],
+                        wave_frames=gesture_config["wave_frames"],
+                        wave_reversals=gesture_config["wave_reversals"],
+                        wave_amplitude=gesture_config["wave_amplitude"],
+                        hold_frames=gesture_config["hold_frames"]
+                    )
+
+        self.overlay = OverlayLayer() if CONFIG["detection_controller"].get("cached_overlay", False) else None
+
+        self.cascade = None
+        cascade_config = CONFIG["detection_controller"].get("cascade", {})
+        if cascade_config.get("enabled", False):
+            self.cascade = PoseCascade(cascade_config)
+            for idx in self.cascade.targets:
+                # crops of different people/hands can't share one tracking state
+                self.detectors[idx][1].running_mode = "image"
         self.is_running = False
         self.draw_thread = None
+        self.executor = None
+        # optional sink with record(stage, seconds): Metrics when enabled, or the benchmark's StageTimer
+        self.stage_timer = None
+        self.metrics = None
+        self.metrics_config = CONFIG.get("metrics", {})
+        if self.metrics_config.get("enabled", False):
+            self.metrics = Metrics(
+                self.metrics_config["histogram_buckets_ms"],
+                overlay=self.metrics_config.get("overlay", False)
+            )
+            self.stage_timer = self.metrics
 
         self.draw_fps = CONFIG["detection_controller"]["draw_fps"]
         self.thread_timeout = CONFIG["detection_controller"]["thread_timeout"]
+        self.scheduler = FrameScheduler(self.draw_fps)
+        self.execution_mode = CONFIG["detection_controller"].get("execution_mode", "serial")
+        self.max_workers = CONFIG["detection_controller"].get("max_workers", len(self.detectors))
+        self.process_pool = None
+        if self.execution_mode == "process":
+            pool_config = CONFIG["detection_controller"].get("process_pool", {})
+            self.process_pool = ProcessDetectorPool(
+                {int(k): v["class"] for k, v in CONFIG["detection_controller"]["detectors"].items()},
+                num_slots=pool_config.get("ring_slots", 4),
+                result_timeout=pool_config.get("result_timeout", 0.1),
+                max_restarts=pool_config.get("max_restarts", 5),
+                restart_delay=pool_config.get("restart_delay", 0.5)
+            )
+        self.quality = None
+        quality_config = CONFIG["detection_controller"].get("quality", {})
+        if quality_config.get("enabled", False):
+            if self.process_pool is not None:
+                print("[Quality] Adaptive quality isn't available in process execution mode")
+            else:
+                self.quality = QualityController(
+                    quality_config["ladder"],
+                    self.draw_fps or camera_config["fps"],
+                    overload_ratio=quality_config["overload_ratio"],
+                    headroom_ratio=quality_config["headroom_ratio"],
+                    window=quality_config["window"],
+                    cooldown=quality_config["cooldown"]
+                )
+        models_config = CONFIG["detection_controller"].get("models", {})
+        self.model_manager = ModelManager(
+            max_loaded_models=models_config.get("max_loaded_models", 0),
+            max_memory_mb=models_config.get("max_memory_mb", 0),
+            unload_on_disable=models_config.get("unload_on_disable", False)
+        )
+        self.startup_config = CONFIG["detection_controller"].get("startup", {})
         self.command_prompt = CONFIG["detection_controller"]["commands"]["prompt"]
         self.invalid_cmd_msg = CONFIG["detection_controller"]["commands"]["invalid_msg"]
         self.exit_cmd = CONFIG["detection_controller"]["commands"]["exit_cmd"]
 
-    def show_status(self):
-        print("\n--------------------------------------------------")
-        print("Current Detection Status:")
+        self.pending_commands = queue.SimpleQueue()
+        self.stop_event = threading.Event()
+        control_config = CONFIG["detection_controller"].get("control", {})
+        self.interactive = control_config.get("interactive", True)
+        self.control_server = None
+        if control_config.get("enabled", False):
+            self.control_server = ControlServer(self, control_config["socket_path"])
+
+    def status_text(self):
+        lines = ["Current Detection Status:"]
         for idx, (name, detector) in self.detectors.items():
             status = "On" if detector.enabled else "Off"
-            print(f"   {idx} - {name} -- {status}")
+            lines.append(f"   {idx} - {name} -- {status}")
+        return "\n".join(lines)
+
+    def metrics_text(self):
+        if self.metrics is not None:
+            return self.metrics.to_prometheus()
+        return (
+            f"{self.scheduler.report()}\n"
+            f"{self.frame_pool.report()}\n"
+            f"Camera: {getattr(self.camera, 'frame_seq', 0)} captured, "
+            f"{getattr(self.camera, 'dropped_frames', 0)} dropped"
+        )
+
+    def show_status(self):
+        print("\n--------------------------------------------------")
+        print(self.status_text())
         print("--------------------------------------------------")
 
     def parse_command(self, cmd):
@@ -43,6 +194,8 @@ class DetectionController:
         
         if cmd == self.exit_cmd:
             return ("exit", None)
+        if cmd in ("status", "metrics"):
+            return (cmd, None)
         
         parts = cmd.split()
         if len(parts) != 2:
@@ -60,53 +213,411 @@ class DetectionController:
         except ValueError:
             return None
 
+    def submit_command(self, action, detector_id):
+        future = Future()
+        if self.draw_thread is None or not self.draw_thread.is_alive():
+            self._apply_command(action, detector_id, future)
+        else:
+            self.pending_commands.put((action, detector_id, future))
+        return future
+
+    def _apply_pending_commands(self):
+        # called by the draw thread between frames so detector state never changes mid-frame
+        while True:
+            try:
+                action, detector_id, future = self.pending_commands.get_nowait()
+            except queue.Empty:
+                return
+            self._apply_command(action, detector_id, future)
+
+    def _apply_command(self, action, detector_id, future):
+        try:
+            self.toggle_detector(action, detector_id)
+            name, detector = self.detectors[detector_id]
+            future.set_result(f"{detector_id} - {name} -- {'On' if detector.enabled else 'Off'}")
+        except Exception as e:
+            future.set_exception(e)
+
+    def request_exit(self):
+        self.is_running = False
+        self.stop_event.set()
+
     def toggle_detector(self, action, detector_id):
         name, detector = self.detectors[detector_id]
+        if self.process_pool is not None:
+            # the model lives in the detector's worker process, this copy only draws
+            detector.enabled = action == "enable"
+            print(f"{name} {'enabled' if detector.enabled else 'disabled'} (worker process)")
+            if detector.enabled:
+                self.process_pool.reset_worker(detector_id)
+            else:
+                self.last_results.pop(detector_id, None)
+                if self.model_manager.unload_on_disable:
+                    self.process_pool.stop_worker(detector_id)
+            return
+
         if action == "enable":
+            self.model_manager.reserve(detector_id, detector)
             detector.enable()
+            self.model_manager.mark_loaded(detector_id, detector)
         elif action == "disable":
             detector.disable()
+            self.last_results.pop(detector_id, None)
+            self.model_manager.release(detector_id, detector)
+
+    def _detect_stage(self, packet):
+        static = False
+        if self.motion_gate is not None and self.last_results:
+            start = time.perf_counter()
+            static = not self.motion_gate.has_changed(packet.frame)
+            self._record_stage("motion_gate", start)
+
+        scheduled = []
+        for idx, (name, detector) in self.detectors.items():
+            if not detector.enabled:
+                continue
+            if idx in self.last_results and (static or not self.scheduler.should_run(self.cadences[idx])):
+                packet.results[idx] = self.last_results[idx]
+            else:
+                scheduled.append((idx, detector))
+
+        if scheduled and self.process_pool is None:
+            # build the shared RGB images up front so their cost isn't charged to the first detector
+            start = time.perf_counter()
+            for size in {detector.inference_size for idx, detector in scheduled}:
+                packet.get_mp_image(size)
+            self._record_stage("color_conversion", start)
+
+        if self._cascade_active():
+            direct, cascaded = self.cascade.split(scheduled)
+            self._run_detectors(packet, direct)
+            self._run_cascaded(packet, cascaded)
+        else:
+            self._run_detectors(packet, scheduled)
+        for idx, detector in scheduled:
+            self.last_results[idx] = packet.results.get(idx)
+        return {idx for idx, detector in scheduled}
+
+    def _track_stage(self, packet, inferred):
+        # returns the detectors whose result this frame is a fresh observation
+        start = time.perf_counter()
+        fresh = set(inferred)
+        for idx, tracker in self.trackers.items():
+            name, detector = self.detectors[idx]
+            if not detector.enabled:
+                tracker.reset()
+                self.track_inputs.pop(idx, None)
+                continue
+            result = packet.results.get(idx)
+            # live_stream mode hands back the same result until the next callback; that's not a new observation
+            if idx in inferred and result is not None and result is not self.track_inputs.get(idx):
+                self.track_inputs[idx] = result
+                arrays = detector.to_arrays(result)
+                packet.tracks[idx] = (tracker.update(arrays, packet.timestamp), arrays)
+                continue
+            # skipped, failed or repeated inference: draw where the tracks should be by now
+            fresh.discard(idx)
+            arrays, ids = tracker.coast(packet.timestamp)
+            if arrays is not None:
+                packet.results[idx] = detector.from_arrays(arrays)
+                packet.tracks[idx] = (ids, arrays)
+        self._record_stage("tracking", start)
+        return fresh
+
+    def _gesture_stage(self, packet, inferred):
+        start = time.perf_counter()
+        for idx, classifier in self.gesture_classifiers.items():
+            name, detector = self.detectors[idx]
+            result = packet.results.get(idx)
+            if not detector.enabled or result is None:
+                classifier.reset()
+                self.gesture_inputs.pop(idx, None)
+                continue
+            cached_result, cached_ids, gestures = self.gesture_inputs.get(idx, (None, None, None))
+            if idx in inferred and result is not cached_result:
+                ids, arrays = packet.tracks.get(idx) or (None, detector.to_arrays(result))
+                landmarks = arrays["landmarks"]
+                gestures = (classifier.update(landmarks, ids), landmarks[:, WRIST, :2])
+                self.gesture_inputs[idx] = (result, ids, gestures)
+            elif gestures is None:
+                continue
+            elif idx in packet.tracks and cached_ids is not None:
+                # a coasted result is extrapolated, not observed: carry the last codes along each track
+                ids, arrays = packet.tracks[idx]
+                codes = dict(zip(cached_ids.tolist(), gestures[0].tolist()))
+                gestures = (
+                    np.array([codes.get(track_id, NONE) for track_id in ids.tolist()], dtype=np.int8),
+                    arrays["landmarks"][:, WRIST, :2]
+                )
+            packet.gestures[idx] = gestures
+        self._record_stage("gestures", start)
+
+    def _cascade_active(self):
+        if self.cascade is None or self.process_pool is not None:
+            return False
+        name, pose_detector = self.detectors[self.cascade.pose_id]
+        return pose_detector.enabled
+
+    def _run_cascaded(self, packet, cascaded):
+        if not cascaded:
+            return
+        pose_result = packet.results.get(self.cascade.pose_id)
+        rois = self.cascade.rois(pose_result, packet.frame.shape[:2])
+        for idx, detector in cascaded:
+            start = time.perf_counter()
+            packet.results[idx] = self.cascade.detect(detector, self.cascade.targets[idx], packet, rois)
+            self._record_stage(f"inference_{detector.RESULT_KEY}", start)
+
+    def _run_detectors(self, packet, enabled):
+        if self.process_pool is not None and enabled:
+            self._run_in_processes(packet, enabled)
+            return
+
+        if self.executor is None or len(enabled) < 2:
+            for idx, detector in enabled:
+                packet.results[idx] = self._timed_detect(detector, packet)
+            return
+
+        # the packet's images are already built by _detect_stage, so workers don't race on the lazy conversion
+        futures = {
+            idx: self.executor.submit(self._timed_detect, detector, packet)
+            for idx, detector in enabled
+        }
+        for idx, future in futures.items():
+            try:
+                packet.results[idx] = future.result()
+            except Exception as e:
+                print(f"\nDetector {idx} inference error: {e}")
+                packet.results[idx] = None
+
+    def _run_in_processes(self, packet, enabled):
+        start = time.perf_counter()
+        arrays = self.process_pool.process(
+            packet.frame, packet.frame_id, packet.timestamp_ms, [idx for idx, detector in enabled]
+        )
+        self._record_stage("inference_processes", start)
+        for idx, detector in enabled:
+            if idx in self.process_pool.failed:
+                # the worker kept exiting (bad model, failed import): stop drawing its stale result
+                print(f"\n[Process Pool] {self.detectors[idx][0]} disabled, its worker could not be kept running")
+                detector.enabled = False
+                self.last_results.pop(idx, None)
+                packet.results.pop(idx, None)
+            elif idx in arrays:
+                packet.results[idx] = detector.from_arrays(arrays[idx])
+            else:
+                # dropped or late frame: keep drawing the previous result
+                packet.results[idx] = self.last_results.get(idx)
+
+    def _timed_detect(self, detector, packet):
+        start = time.perf_counter()
+        result = packet.detect(detector)
+        self._record_stage(f"inference_{detector.RESULT_KEY}", start)
+        return result
+
+    def _record_stage(self, stage, start):
+        now = time.perf_counter()
+        if self.stage_timer is not None:
+            self.stage_timer.record(stage, now - start)
+        return now
+
+    def _publish_stage(self, packet):
+        start = time.perf_counter()
+        arrays = {}
+        for idx, result in packet.results.items():
+            name, detector = self.detectors[idx]
+            arrays[detector.RESULT_KEY] = detector.to_arrays(result)
+        self.publisher.publish(packet.frame_id, packet.timestamp, arrays)
+        self._record_stage("publish", start)
+
+    def _render_stage(self, packet):
+        if self.overlay is None:
+            return self._draw_annotations(packet, packet.frame)
+
+        return self.overlay.render(
+            list(packet.results.items()), packet.frame, lambda image: self._draw_annotations(packet, image)
+        )
+
+    def _draw_annotations(self, packet, frame):
+        for idx, result in packet.results.items():
+            name, detector = self.detectors[idx]
+            frame = detector.draw(frame, result)
+            if idx in packet.tracks and self.tracking_config.get("draw_ids", True):
+                ids, arrays = packet.tracks[idx]
+                anchors = track_anchors(arrays, self.trackers[idx].state_key, packet.frame_size)
+                frame = draw_track_ids(frame, anchors, ids, self.tracking_config["text"])
+            if idx in packet.gestures:
+                codes, wrists = packet.gestures[idx]
+                height, width = packet.frame_size
+                anchors = (wrists * (width, height)).astype(np.int32)
+                labels = [GESTURE_NAMES[code] for code in codes.tolist()]
+                frame = draw_text_labels(frame, anchors, labels, detector.draw_config["gesture_text"])
+        return frame
+
+    def start_executor(self):
+        if self.execution_mode == "parallel" and self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="detector")
+
+    def stop_executor(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.process_pool is not None:
+            self.process_pool.close()
 
     def _draw_loop(self):
+        self.scheduler.start()
         while self.is_running and self.camera.is_running:
             try:
-                frame = self.camera.get_frame()
+                self._apply_pending_commands()
+                frame_start = time.perf_counter()
+                frame, timestamp, seq = self.camera.get_latest()
                 if frame is None:
                     time.sleep(0.01)
                     continue
+                start = self._record_stage("capture", frame_start)
 
-                frame = flip_frame(frame)
-                
-                for idx, (name, detector) in self.detectors.items():
-                    frame = detector.draw(frame)
+                flipped = flip_frame(frame, dst=self.frame_pool.acquire("flip", frame.shape))
+                packet = FramePacket(flipped, timestamp, seq, pool=self.frame_pool)
+                self._record_stage("flip", start)
+                inferred = self._detect_stage(packet)
+                if self.trackers:
+                    inferred = self._track_stage(packet, inferred)
+                if self.gesture_classifiers:
+                    self._gesture_stage(packet, inferred)
+                if self.publisher is not None and self.publisher.has_subscribers:
+                    self._publish_stage(packet)
+
+                start = time.perf_counter()
+                frame = self._render_stage(packet)
+                if self.metrics is not None:
+                    self.metrics.update_camera(self.camera)
+                    self.metrics.update_pool(self.frame_pool)
+                    if hasattr(self.camera, "frame_pool"):
+                        self.metrics.update_pool(self.camera.frame_pool)
+                    if self.metrics.overlay:
+                        frame = self.metrics.draw_overlay(frame)
+                start = self._record_stage("draw", start)
                 
                 self.camera.show_frame(frame)
+                self._record_stage("display", start)
+                if not self.first_frame_shown:
+                    self.first_frame_shown = True
+                    print(f"[Startup] First annotated frame after {time.perf_counter() - self.started_at:.2f}s")
+                self._record_stage("frame", frame_start)
+                if self.quality is not None:
+                    # switches happen here, between frames, so no detector changes under a running inference
+                    self.quality.observe(time.perf_counter() - frame_start, self.detectors)
                 
-                time.sleep(1/self.draw_fps)
+                self.scheduler.wait()
             except Exception as e:
                 print(f"\nDraw loop error: {e}")
                 time.sleep(0.01)
+        print(f"\n{self.scheduler.report()}")
+        if self.motion_gate is not None:
+            print(self.motion_gate.report())
+        if self.overlay is not None:
+            print(self.overlay.report())
+        print(self.frame_pool.report())
+        if self.quality is not None:
+            print(self.quality.report())
 
-    def run(self):
-        print("=== Multi-Function Visual Detection Program ===")
-        detector_ids = [str(k) for k in self.detectors.keys()]
-        detector_keys_str = ', '.join(map(str, self.detectors.keys()))
-        print(f"Commands:\n  Enable X (X={detector_keys_str})\n  Disable X (X={detector_keys_str})\n  {self.exit_cmd}\n")
-    
+    def warm_up(self, detector_ids):
+        detector_ids = [idx for idx in detector_ids if idx in self.detectors]
+        if not detector_ids:
+            return
+        if self.process_pool is not None:
+            # worker processes load their own models when they start
+            for idx in detector_ids:
+                self.toggle_detector("enable", idx)
+            return
+
+        start = time.perf_counter()
+        packet = self._blank_packet()
+        # converted up front on this thread, which also pays the one-off mediapipe import
+        for idx in detector_ids:
+            packet.get_mp_image(self.detectors[idx][1].inference_size)
+
+        for idx in detector_ids:
+            self.model_manager.reserve(idx, self.detectors[idx][1])
+        with ThreadPoolExecutor(max_workers=len(detector_ids)) as pool:
+            list(pool.map(lambda idx: self._load_and_warm_up(idx, packet), detector_ids))
+        for idx in detector_ids:
+            name, detector = self.detectors[idx]
+            detector.enable()
+            self.model_manager.mark_loaded(idx, detector)
+        print(f"[Startup] {len(detector_ids)} model(s) ready in {time.perf_counter() - start:.2f}s")
+
+    def _blank_packet(self):
+        resolution = CONFIG["camera"]["resolution"]
+        return FramePacket(np.zeros((resolution["height"], resolution["width"], 3), dtype=np.uint8))
+
+    def _load_and_warm_up(self, idx, packet):
+        name, detector = self.detectors[idx]
+        start = time.perf_counter()
+        if not detector.load():
+            return
+        try:
+            if detector.warm_up(packet.get_mp_image(detector.inference_size)):
+                print(f"[Warm-up] {name} loaded and warmed up in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            print(f"[Warm-up] {name} warm-up failed: {e}")
+
+    def prepare_command(self, action, detector_id):
+        # runs on the prompt / control thread: a new model is loaded and warmed up here, so the
+        # enable the draw thread applies afterwards doesn't stall live frames on graph setup
+        if action != "enable" or self.process_pool is not None:
+            return
+        name, detector = self.detectors[detector_id]
+        if not detector.enabled:
+            self._load_and_warm_up(detector_id, self._blank_packet())
+
+    def start(self):
+        self.stop_event.clear()
+        startup_ids = self.startup_config.get("enable", [])
+        if self.startup_config.get("warm_up", True):
+            self.warm_up(startup_ids)
+        else:
+            for idx in startup_ids:
+                self.toggle_detector("enable", idx)
         print("Starting camera...")
         try:
             self.camera.start()
         except RuntimeError as e:
             print(f"Failed to start camera, exiting: {e}")
-            return
+            return False
     
+        self.start_executor()
+        if self.publisher is not None:
+            self.publisher.start()
+        if self.metrics is not None and self.metrics_config.get("port", 0):
+            self.metrics.start_server(self.metrics_config["host"], self.metrics_config["port"])
+
         self.is_running = True
         self.draw_thread = threading.Thread(target=self._draw_loop, daemon=True)
         self.draw_thread.start()
+        return True
+
+    def stop(self):
+        self.is_running = False
+        self.camera.stop()
+        if self.draw_thread is not None and self.draw_thread.is_alive():
+            self.draw_thread.join(timeout=self.thread_timeout)
+        self.stop_executor()
+        if self.publisher is not None:
+            self.publisher.stop()
+        if self.metrics is not None:
+            self.metrics.stop_server()
+        self.model_manager.unload_all()
 
+    def _prompt_loop(self):
         while self.is_running:
             self.show_status()
-            cmd = input(self.command_prompt).strip()
+            try:
+                cmd = input(self.command_prompt).strip()
+            except EOFError:
+                # stdin closed (running as a service): keep serving the control socket
+                return
             parsed = self.parse_command(cmd)
         
             if not parsed:
@@ -115,13 +626,40 @@ class DetectionController:
         
             action, detector_id = parsed
             if action == "exit":
-                break
-            self.toggle_detector(action, detector_id)
+                self.request_exit()
+                return
+            if action == "metrics":
+                print(self.metrics_text())
+                continue
+            if action == "status":
+                continue
+            try:
+                self.prepare_command(action, detector_id)
+                self.submit_command(action, detector_id).result(timeout=self.thread_timeout * 5)
+            except Exception as e:
+                print(f"Command failed: {e}")
 
-        self.is_running = False
-        self.camera.stop()
-        if self.draw_thread is not None and self.draw_thread.is_alive():
-            self.draw_thread.join(timeout=self.thread_timeout)
+    def run(self):
+        print("=== Multi-Function Visual Detection Program ===")
+        detector_ids = [str(k) for k in self.detectors.keys()]
+        detector_keys_str = ', '.join(map(str, self.detectors.keys()))
+        print(f"Commands:\n  Enable X (X={detector_keys_str})\n  Disable X (X={detector_keys_str})\n  status\n  metrics\n  {self.exit_cmd}\n")
+    
+        if not self.start():
+            return
+
+        if self.control_server is not None:
+            self.control_server.start()
+        if self.interactive:
+            # the terminal prompt is just one more client of the command queue
+            threading.Thread(target=self._prompt_loop, daemon=True).start()
+
+        while self.is_running and self.camera.is_running:
+            self.stop_event.wait(0.5)
+
+        if self.control_server is not None:
+            self.control_server.stop()
+        self.stop()
         print("\nShutting down...")
         print("All resources released, program exited safely")
 
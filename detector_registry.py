@@ -0,0 +1,20 @@
+from face_detection import FaceDetection
+from hand_gesture_detection import HandGestureDetection
+from human_stickman_detection import HumanStickmanDetection
+
+DETECTOR_REGISTRY = {
+    "FaceDetection": FaceDetection,
+    "HandGestureDetection": HandGestureDetection,
+    "HumanStickmanDetection": HumanStickmanDetection
+}
+
+def register_detector(name, factory):
+    if name in DETECTOR_REGISTRY:
+        raise ValueError(f"Detector already registered: {name}")
+    DETECTOR_REGISTRY[name] = factory
+
+def create_detector(name):
+    factory = DETECTOR_REGISTRY.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown detector class: {name} (registered: {', '.join(DETECTOR_REGISTRY)})")
+    return factory()
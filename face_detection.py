@@ -1,55 +1,50 @@
 import cv2
+from types import SimpleNamespace
 from config import CONFIG
+from base_detector import BaseDetector
 from utils import (
     load_mediapipe_model,
-    convert_bgr_to_mp_image,
     flip_frame,
+    arrays_to_detections,
+    remap_detections,
+    detections_to_arrays,
     draw_bounding_box
 )
 
-class FaceDetection:
+class FaceDetection(BaseDetector):
+    DISPLAY_NAME = "Face Detection"
+    RESULT_KEY = "face"
+    RESULT_LISTS = ("detections",)
+
     def __init__(self):
-        self.enabled = False
-        self.detector = None
-        self.model_path = CONFIG["face_detection"]["model_path"]
+        super().__init__(CONFIG["face_detection"])
         self.min_detection_confidence = CONFIG["face_detection"]["min_detection_confidence"]
-        self.draw_config = CONFIG["face_detection"]["draw"]
-        self._init_detector()
 
     def _init_detector(self):
         self.detector = load_mediapipe_model(
             model_path=self.model_path,
             task_type="face_detector",
+            running_mode=self.running_mode,
+            result_callback=self._on_result if self.running_mode == "live_stream" else None,
             min_detection_confidence=self.min_detection_confidence
         )
 
-    def enable(self):
-        if self.detector is None:
-            print("Face Detection cannot be enabled (model missing/failed to load)")
-            return
-        self.enabled = True
-        print("Face Detection Enabled")
-
-    def disable(self):
-        self.enabled = False
-        print("Face Detection Disabled")
+    def to_arrays(self, detection_result):
+        detections = detection_result.detections if detection_result else []
+        return detections_to_arrays(detections)
 
-    def detect(self, frame):
-        if not self.enabled or frame is None or self.detector is None:
-            return None
+    def from_arrays(self, arrays):
+        return SimpleNamespace(detections=arrays_to_detections(arrays["boxes"], arrays["scores"]))
 
-        mp_image = convert_bgr_to_mp_image(frame)
-        if mp_image is None:
-            return None
-        return self.detector.detect(mp_image)
+    def remap_result(self, detection_result, roi, input_size, frame_size):
+        if detection_result and detection_result.detections:
+            remap_detections(detection_result.detections, roi, input_size, frame_size)
+        return detection_result
 
-    def draw(self, frame):
-        if not self.enabled or frame is None or self.detector is None:
+    def draw(self, frame, detection_result):
+        if not self.enabled or frame is None:
             return frame
         
-        # frame = flip_frame(frame)
-        detection_result = self.detect(frame)
-        
         if not detection_result or not detection_result.detections:
             return frame
         
@@ -61,7 +56,7 @@ class FaceDetection:
             frame = draw_bounding_box(
                 frame=frame,
                 bbox=detection.bounding_box,
-                box_color=tuple(self.draw_config["box_color"]),
+                box_color=self.draw_config["box_color"],
                 box_thickness=self.draw_config["box_thickness"],
                 label=label,
                 label_config=self.draw_config["text"]
@@ -0,0 +1,60 @@
+import cv2
+from utils import convert_bgr_to_mp_image
+
+class FramePacket:
+    def __init__(self, frame, timestamp=0.0, frame_id=0, pool=None):
+        self.frame = frame
+        self.pool = pool
+        self.timestamp = timestamp
+        self.frame_id = frame_id
+        self.results = {}
+        self.tracks = {}
+        self.gestures = {}
+        self._mp_image = None
+        self._scaled_images = {}
+
+    @property
+    def mp_image(self):
+        if self._mp_image is None and self.frame is not None:
+            self._mp_image = convert_bgr_to_mp_image(self.frame, dst=self._buffer("rgb", self.frame.shape))
+        return self._mp_image
+
+    @property
+    def frame_size(self):
+        return self.frame.shape[:2]
+
+    @property
+    def timestamp_ms(self):
+        return int(self.timestamp * 1000)
+
+    def get_mp_image(self, size=None):
+        # one downscaled RGB image per distinct (width, height), shared by every detector asking for it
+        if size is None or self.frame is None:
+            return self.mp_image
+        height, width = self.frame_size
+        if size[0] >= width and size[1] >= height:
+            return self.mp_image
+
+        mp_image = self._scaled_images.get(size)
+        if mp_image is None:
+            shape = (size[1], size[0], self.frame.shape[2])
+            resized = cv2.resize(self.frame, size, dst=self._buffer(f"resized_{size}", shape), interpolation=cv2.INTER_AREA)
+            rgb = self._buffer(f"rgb_{size}", shape)
+            mp_image = self._scaled_images[size] = convert_bgr_to_mp_image(resized, dst=rgb)
+        return mp_image
+
+    def _buffer(self, name, shape):
+        return self.pool.acquire(name, shape) if self.pool is not None else None
+
+    def detect(self, detector):
+        size = detector.inference_size
+        mp_image = self.get_mp_image(size)
+        result = detector.detect(mp_image, self.timestamp_ms)
+        if mp_image is self._mp_image or result is None or result is detector.remapped_result:
+            return result
+
+        # live_stream detectors hand back the same result until a new one arrives, remap it only once
+        height, width = self.frame_size
+        detector.remap_result(result, (0, 0, width, height), (mp_image.width, mp_image.height), (height, width))
+        detector.remapped_result = result
+        return result
@@ -0,0 +1,36 @@
+import threading
+import numpy as np
+
+class FramePool:
+    def __init__(self, name="frame"):
+        self.name = name
+        # name -> [buffers, next position]
+        self.rings = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, name, shape, slots=2, dtype=np.uint8):
+        # buffers of one name are handed out round-robin, so a buffer is reused only `slots` acquires later
+        with self._lock:
+            ring = self.rings.get(name)
+            if ring is None or len(ring[0]) != slots:
+                ring = self.rings[name] = [[None] * slots, 0]
+            buffers, position = ring
+            ring[1] = (position + 1) % slots
+
+            buffer = buffers[position]
+            if buffer is not None and buffer.shape == shape and buffer.dtype == dtype:
+                self.hits += 1
+                return buffer
+            # first use, or the resolution changed
+            self.misses += 1
+            buffer = buffers[position] = np.empty(shape, dtype=dtype)
+            return buffer
+
+    def clear(self):
+        with self._lock:
+            self.rings.clear()
+
+    def report(self):
+        return f"{self.name.capitalize()} buffer pool: {self.hits} reuses, {self.misses} allocations"
@@ -0,0 +1,51 @@
+import time
+
+class FrameScheduler:
+    def __init__(self, target_fps):
+        # target_fps <= 0 runs unpaced, as fast as frames can be processed
+        self.frame_budget = 1.0 / target_fps if target_fps > 0 else 0.0
+        self.next_deadline = None
+        self.frame_index = 0
+        self.missed_frames = 0
+        self.worst_overrun = 0.0
+
+    def start(self):
+        self.next_deadline = time.monotonic() + self.frame_budget
+        self.frame_index = 0
+        self.missed_frames = 0
+        self.worst_overrun = 0.0
+
+    def should_run(self, cadence):
+        return cadence <= 1 or self.frame_index % cadence == 0
+
+    def wait(self):
+        if self.next_deadline is None:
+            self.start()
+
+        self.frame_index += 1
+        if self.frame_budget == 0.0:
+            return
+
+        now = time.monotonic()
+        remaining = self.next_deadline - now
+        if remaining > 0:
+            time.sleep(remaining)
+            self.next_deadline += self.frame_budget
+            return
+
+        # the frame overran its budget: count it and restart the clock instead of bursting to catch up
+        self.missed_frames += 1
+        self.worst_overrun = max(self.worst_overrun, -remaining)
+        self.next_deadline = now + self.frame_budget
+
+    def report(self):
+        if self.frame_index == 0:
+            return "Frame scheduler: no frames processed"
+        if self.frame_budget == 0.0:
+            return f"Frame scheduler: {self.frame_index} frames processed unpaced"
+        missed_ratio = self.missed_frames / self.frame_index * 100
+        return (
+            f"Frame scheduler: {self.missed_frames}/{self.frame_index} frames missed the "
+            f"{self.frame_budget * 1000:.1f} ms budget ({missed_ratio:.1f}%), "
+            f"worst overrun {self.worst_overrun * 1000:.1f} ms"
+        )
@@ -0,0 +1,177 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+PALM = [0, 5, 9, 13, 17]
+# (base, middle joint, tip) of each finger, thumb first
+FINGERS = np.array([[2, 3, 4], [5, 6, 8], [9, 10, 12], [13, 14, 16], [17, 18, 20]])
+# per-frame palm movement below this (fraction of the frame) is treated as jitter
+WAVE_MIN_STEP = 0.004
+
+# gestures are handled as integer codes; GESTURE_NAMES turns them into text for drawing
+NONE, OPEN_PALM, POINTING, FIST, SWIPE_LEFT, SWIPE_RIGHT, WAVE = range(7)
+GESTURE_NAMES = ["", "open_palm", "pointing", "fist", "swipe_left", "swipe_right", "wave"]
+
+PALM_WEIGHTS = np.zeros(NUM_LANDMARKS, dtype=np.float32)
+PALM_WEIGHTS[PALM] = 1 / len(PALM)
+# every vector the pose test needs as landmark weights, one row per finger in four blocks:
+# lower bone, upper bone, tip from the wrist, middle joint from the wrist
+FINGER_VECTORS = np.zeros((4 * len(FINGERS), NUM_LANDMARKS), dtype=np.float32)
+for finger, (base, middle, tip) in enumerate(FINGERS):
+    for block, (head, tail) in enumerate([(middle, base), (tip, middle), (tip, WRIST), (middle, WRIST)]):
+        FINGER_VECTORS[block * len(FINGERS) + finger, [head, tail]] = 1, -1
+FINGER_BITS = 1 << np.arange(len(FINGERS))
+# pose of every combination of extended fingers, bit 0 = thumb
+POSE_CODES = np.full(1 << len(FINGERS), NONE, dtype=np.int8)
+POSE_CODES[0b11111] = OPEN_PALM
+POSE_CODES[[0b00010, 0b00011]] = POINTING
+POSE_CODES[[0b00000, 0b00001]] = FIST
+
+class GestureClassifier:
+    def __init__(
+        self,
+        max_hands=2,
+        history=30,
+        straight_cos=0.7,
+        swipe_frames=10,
+        swipe_distance=0.25,
+        wave_frames=30,
+        wave_reversals=3,
+        wave_amplitude=0.05,
+        hold_frames=15
+    ):
+        self.max_hands = max_hands
+        self.history = history
+        self.straight_cos = straight_cos
+        self.swipe_frames = min(swipe_frames, history)
+        self.swipe_distance = swipe_distance
+        self.wave_frames = min(wave_frames, history)
+        self.wave_reversals = wave_reversals
+        self.wave_amplitude = wave_amplitude
+        self.hold_frames = hold_frames
+
+        # ring buffer indexed [hand slot, frame]; frame % history is the next position to write
+        self.centers = np.zeros((max_hands, history, 2), dtype=np.float32)
+        self.frame = 0
+        # consecutive frames each slot has been seen, so "the whole window is valid" is one comparison
+        self.streak = np.zeros(max_hands, dtype=np.int64)
+        self.slots = {}
+        # track ids of the last frame and their slots, reused while the same tracks stay in view
+        self.track_ids = None
+        self.track_slots = None
+        self.motion_codes = np.zeros(max_hands, dtype=np.int8)
+        # a fired motion replaces the pose label until this frame
+        self.motion_until = np.zeros(max_hands, dtype=np.int64)
+
+        # ring indices of the motion window (oldest first) ending at every write position
+        window = max(self.swipe_frames, self.wave_frames)
+        self.orders = (np.arange(history)[:, None] + 1 - window + np.arange(window)) % history
+        self.motion_frames = min(self.swipe_frames, self.wave_frames)
+        self.slot_range = np.arange(max_hands)
+        self.steps = np.arange(self.wave_frames - 1)
+        self.rows = self.slot_range[:, None]
+
+    def reset(self):
+        self.streak.fill(0)
+        self.motion_until.fill(0)
+        self.slots = {}
+        self.track_ids = None
+
+    def update(self, landmarks, ids=None):
+        # landmarks: (N, 21, 3) normalized hand landmarks of one frame; returns one gesture code per hand
+        hands, slots = self._assign_slots(len(landmarks), ids)
+        frame = self.frame
+        position = frame % self.history
+        self.frame += 1
+
+        codes = np.zeros(len(landmarks), dtype=np.int8)
+        streak = self.streak[slots] + 1
+        self.streak.fill(0)
+        if not len(slots):
+            return codes
+        self.streak[slots] = streak
+        points = landmarks[hands, :, :2]
+        centers = PALM_WEIGHTS @ points
+        self.centers[slots, position] = centers
+
+        poses = self._classify_poses(points)
+        if streak.max() >= self.motion_frames:
+            motions = self._classify_motions(position, slots, streak, centers, poses == OPEN_PALM)
+            fired = motions != NONE
+            if fired.any():
+                fired_slots = slots[fired]
+                self.motion_codes[fired_slots] = motions[fired]
+                self.motion_until[fired_slots] = frame + self.hold_frames
+                # start the motion history over so one movement is reported once
+                self.streak[fired_slots] = 0
+
+        if self.motion_until.max() > frame:
+            poses = np.where(self.motion_until[slots] > frame, self.motion_codes[slots], poses)
+        codes[hands] = poses
+        return codes
+
+    def _assign_slots(self, count, ids):
+        # -> (hands, slots): which of the `count` hands got a slot, and their slots
+        if ids is None:
+            slots = self.slot_range[:count]
+            return slice(0, len(slots)), slots
+
+        track_ids = ids.tolist()
+        if track_ids == self.track_ids:
+            return slice(None), self.track_slots
+
+        # a track keeps its slot; slots of vanished tracks go to new ones with a clean history
+        kept = {track_id: self.slots[track_id] for track_id in track_ids if track_id in self.slots}
+        free = [slot for slot in range(self.max_hands) if slot not in kept.values()]
+        hands = []
+        for i, track_id in enumerate(track_ids):
+            if track_id not in kept:
+                if not free:
+                    continue
+                kept[track_id] = free.pop(0)
+                self.streak[kept[track_id]] = 0
+                self.motion_until[kept[track_id]] = 0
+            hands.append(i)
+        self.slots = kept
+        slots = np.array([kept[track_ids[i]] for i in hands], dtype=np.intp)
+        if len(hands) < count:
+            self.track_ids = None
+            return hands, slots
+        self.track_ids, self.track_slots = track_ids, slots
+        return slice(None), slots
+
+    def _classify_poses(self, points):
+        # points: (H, 21, 2) -> finger features for every hand at once
+        n = len(FINGERS)
+        vectors = FINGER_VECTORS @ points
+        lengths = np.einsum("hvd,hvd->hv", vectors, vectors)
+        # cos(lower bone, upper bone) > straight_cos, without dividing by the bone lengths
+        dot = np.einsum("hfd,hfd->hf", vectors[:, :n], vectors[:, n:2 * n])
+        straight = dot > self.straight_cos * (np.sqrt(lengths[:, :n] * lengths[:, n:2 * n]) + 1e-6)
+        extended = straight & (lengths[:, 2 * n:3 * n] > lengths[:, 3 * n:])
+        return POSE_CODES[extended.dot(FINGER_BITS)]
+
+    def _classify_motions(self, position, hand_slots, streak, centers, open_palm):
+        # centers: palm centers of this frame, already written to the ring at `position`
+        order = self.orders[position]
+        moved = centers - self.centers[hand_slots, order[-self.swipe_frames]]
+        distance = np.abs(moved)
+        swiped = (streak >= self.swipe_frames) & (distance[:, 0] > np.maximum(self.swipe_distance, 2 * distance[:, 1]))
+        # the flipped preview is mirrored, so image left is the user's left
+        motions = np.where(moved[:, 0] < 0, SWIPE_LEFT, SWIPE_RIGHT) * swiped
+
+        waving = open_palm & (streak >= self.wave_frames)
+        if not waving.any():
+            return motions
+        x = self.centers[hand_slots[:, None], order[-self.wave_frames:], 0]
+        waving &= x.max(axis=1) - x.min(axis=1) > self.wave_amplitude
+        if not waving.any():
+            return motions
+        steps = x[:, 1:] - x[:, :-1]
+        signs = np.sign(steps) * (np.abs(steps) > WAVE_MIN_STEP)
+        # carry the last real direction over still frames, so a pause at the turn still counts as a reversal
+        last_moving = np.maximum.accumulate(self.steps * (signs != 0), axis=1)
+        directions = signs[self.rows[:len(signs)], last_moving]
+        reversals = (directions[:, 1:] * directions[:, :-1] < 0).sum(axis=1)
+        motions[waving & (reversals >= self.wave_reversals)] = WAVE
+        return motions
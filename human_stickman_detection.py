@@ -1,87 +1,81 @@
 import cv2
+from types import SimpleNamespace
 from config import CONFIG
+from base_detector import BaseDetector
 from utils import (
     load_mediapipe_model,
-    convert_bgr_to_mp_image,
     flip_frame,
+    array_to_landmark_lists,
+    remap_landmark_lists,
+    landmark_lists_to_array,
     draw_landmark_points,
     draw_landmark_connections
 )
 
-class HumanStickmanDetection:
-    def __init__(self):
-        self.enabled = False
-        self.detector = None
+class HumanStickmanDetection(BaseDetector):
+    DISPLAY_NAME = "Human Stick Figure Detection"
+    NUM_LANDMARKS = 33
+    RESULT_KEY = "pose"
+    LANDMARKS_FIELD = "pose_landmarks"
+    RESULT_LISTS = ("pose_landmarks", "pose_world_landmarks")
 
-        self.model_path = CONFIG["human_stickman_detection"]["model_path"]
+    def __init__(self):
+        super().__init__(CONFIG["human_stickman_detection"])
         self.num_poses = CONFIG["human_stickman_detection"]["num_poses"]
         self.min_pose_detection_confidence = CONFIG["human_stickman_detection"]["min_pose_detection_confidence"]
         self.min_pose_presence_confidence = CONFIG["human_stickman_detection"]["min_pose_presence_confidence"]
         self.min_tracking_confidence = CONFIG["human_stickman_detection"]["min_tracking_confidence"]
         self.POSE_CONNECTIONS = CONFIG["human_stickman_detection"]["pose_connections"]
-        self.draw_config = CONFIG["human_stickman_detection"]["draw"]
-
-        self._init_detector()
 
     def _init_detector(self):
         self.detector = load_mediapipe_model(
             model_path=self.model_path,
             task_type="pose_landmarker",
+            running_mode=self.running_mode,
+            result_callback=self._on_result if self.running_mode == "live_stream" else None,
             num_poses=self.num_poses,
             min_pose_detection_confidence=self.min_pose_detection_confidence,
             min_pose_presence_confidence=self.min_pose_presence_confidence,
             min_tracking_confidence=self.min_tracking_confidence
         )
 
-    def enable(self):
-        if self.detector is None:
-            print("Human Stick Figure Detection cannot be enabled (model missing/failed to load)")
-            return
-        self.enabled = True
-        print("Human Stick Figure Detection enabled")
+    def to_arrays(self, detection_result):
+        poses = detection_result.pose_landmarks if detection_result else []
+        return {"landmarks": landmark_lists_to_array(poses, self.NUM_LANDMARKS)}
 
-    def disable(self):
-        self.enabled = False
-        print("Human Stick Figure Detection disabled")
+    def from_arrays(self, arrays):
+        poses = array_to_landmark_lists(arrays["landmarks"])
+        return SimpleNamespace(pose_landmarks=poses, pose_world_landmarks=[])
 
-    def detect(self, frame):
-        if not self.enabled or frame is None or self.detector is None:
-            return None
+    def remap_result(self, detection_result, roi, input_size, frame_size):
+        if detection_result and detection_result.pose_landmarks:
+            remap_landmark_lists(detection_result.pose_landmarks, roi, frame_size)
+        return detection_result
 
-        mp_image = convert_bgr_to_mp_image(frame)
-        if mp_image is None:
-            return None
-        return self.detector.detect(mp_image)
-
-    def draw(self, frame):
-        if not self.enabled or frame is None or self.detector is None:
+    def draw(self, frame, detection_result):
+        if not self.enabled or frame is None:
             return frame
         
-        # frame = flip_frame(frame)
-        detection_result = self.detect(frame)
-        
         if not detection_result or not detection_result.pose_landmarks:
             return frame
         
         frame_size = frame.shape[:2]  # (height, width)
         
-        for pose_landmarks in detection_result.pose_landmarks:
+        for points in self._result_points(detection_result, frame_size):
 
             frame = draw_landmark_points(
                 frame=frame,
-                landmarks=pose_landmarks,
-                frame_size=frame_size,
+                points=points,
                 circle_radius=self.draw_config["circle_radius"],
-                circle_color=tuple(self.draw_config["circle_color"])
+                circle_color=self.draw_config["circle_color"]
             )
 
             frame = draw_landmark_connections(
                 frame=frame,
-                landmarks=pose_landmarks,
+                points=points,
                 connections=self.POSE_CONNECTIONS,
-                frame_size=frame_size,
                 line_thickness=self.draw_config["line_thickness"],
-                line_color=tuple(self.draw_config["line_color"])
+                line_color=self.draw_config["line_color"]
             )
         
         return frame
\ No newline at end of file
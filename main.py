@@ -1,24 +1,75 @@
-from detection_controller import DetectionController
+import time
+started_at = time.perf_counter()
+
+import argparse
+import importlib.util
+from config import CONFIG
 
 def show_copyright():
     print("=== Visual Detection Program ===")
     print("Copyright (C) Akira Amatsume\n")
 
 def check_dependencies():
-    try:
-        import cv2
-        import mediapipe
-        import yaml
-        print("Dependencies check passed")
-        return True
-    except ImportError as e:
-        print(f"Dependencies missing: {e}")
+    # locate the packages without importing them; mediapipe alone takes seconds to import
+    missing = [name for name in ("cv2", "mediapipe", "yaml") if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"Dependencies missing: {', '.join(missing)}")
         print("Install required packages: pip install opencv-python mediapipe pyyaml")
         return False
+    print("Dependencies check passed")
+    return True
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Visual Detection Program")
+    parser.add_argument("--batch", nargs="+", metavar="INPUT",
+                        help="run headless over video files / image folders instead of the camera")
+    parser.add_argument("--output", help="output directory for batch results")
+    parser.add_argument("--format", choices=["jsonl", "npz"], help="batch result format")
+    parser.add_argument("--annotate", action="store_true", default=None,
+                        help="also write annotated videos in batch mode")
+    parser.add_argument("--workers", type=int, help="number of batch worker processes")
+    parser.add_argument("--streams", action="store_true",
+                        help="run every source listed under streams in config.yaml in its own process")
+    parser.add_argument("--replay", metavar="RECORDING",
+                        help="replay a .vdrec recording instead of the camera")
+    parser.add_argument("--fast", action="store_true",
+                        help="replay as fast as possible instead of at the original timing")
+    parser.add_argument("--record", metavar="RECORDING", help="record raw camera frames to this file")
+    parser.add_argument("--detectors", type=int, nargs="+", metavar="ID",
+                        help="detector ids to run in batch mode")
+    return parser.parse_args()
 
 if __name__ == "__main__":
+    args = parse_args()
     if not check_dependencies():
         exit(1)
     show_copyright()
-    controller = DetectionController()
+
+    if args.batch:
+        from batch_processor import run_batch
+        run_batch(
+            args.batch,
+            output_dir=args.output,
+            output_format=args.format,
+            annotate=args.annotate,
+            workers=args.workers,
+            detector_ids=args.detectors
+        )
+        exit(0)
+
+    if args.streams or CONFIG["streams"]["enabled"]:
+        from multi_camera import StreamSupervisor
+        StreamSupervisor().run()
+        exit(0)
+
+    if args.record:
+        CONFIG["camera"]["record"] = {"enabled": True, "path": args.record}
+
+    camera = None
+    if args.replay:
+        from recording import ReplaySource
+        camera = ReplaySource(args.replay, realtime=not args.fast)
+
+    from detection_controller import DetectionController
+    controller = DetectionController(camera=camera, started_at=started_at)
     controller.run()
\ No newline at end of file
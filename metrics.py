@@ -0,0 +1,145 @@
+import time
+import bisect
+import threading
+import cv2
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.ewma = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+        self.ewma = value if self.ewma is None else self.ewma * 0.9 + value * 0.1
+
+class Metrics:
+    def __init__(self, buckets_ms, overlay=False):
+        self.buckets = [bucket / 1000 for bucket in buckets_ms]
+        self.overlay = overlay
+        self.histograms = {}
+        self.gauges = {}
+        self.frames_processed = 0
+        self.capture_fps = 0.0
+        self.processed_fps = 0.0
+        self._lock = threading.Lock()
+        self._rate_time = time.monotonic()
+        self._rate_captured = 0
+        self._rate_processed = 0
+        self.server = None
+        self.server_thread = None
+
+    # same signature as StageTimer.record so the controller can feed either one
+    def record(self, stage, seconds):
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if stage == "frame":
+                self.frames_processed += 1
+
+    def set_gauge(self, name, value):
+        self.gauges[name] = value
+
+    def update_camera(self, camera):
+        captured = getattr(camera, "frame_seq", 0)
+        self.gauges["frames_captured"] = captured
+        self.gauges["frames_dropped"] = getattr(camera, "dropped_frames", 0)
+        self.gauges["capture_buffer_depth"] = len(getattr(camera, "_buffer", ()))
+
+        now = time.monotonic()
+        elapsed = now - self._rate_time
+        if elapsed >= 1.0:
+            self.capture_fps = (captured - self._rate_captured) / elapsed
+            self.processed_fps = (self.frames_processed - self._rate_processed) / elapsed
+            self._rate_time = now
+            self._rate_captured = captured
+            self._rate_processed = self.frames_processed
+
+    def update_pool(self, pool):
+        self.gauges[f"{pool.name}_pool_hits"] = pool.hits
+        self.gauges[f"{pool.name}_pool_misses"] = pool.misses
+
+    def draw_overlay(self, frame):
+        if frame is None:
+            return frame
+        lines = [
+            f"Capture {self.capture_fps:.1f} FPS | Processed {self.processed_fps:.1f} FPS",
+            f"Dropped {self.gauges.get('frames_dropped', 0)} | Buffer {self.gauges.get('capture_buffer_depth', 0)}"
+        ]
+        with self._lock:
+            for stage, histogram in self.histograms.items():
+                if stage.startswith("inference_") and histogram.ewma is not None:
+                    lines.append(f"{stage[len('inference_'):]}: {histogram.ewma * 1000:.1f} ms")
+
+        for i, line in enumerate(lines):
+            cv2.putText(frame, line, (10, 20 + i * 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+        return frame
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP detection_frames_processed_total Frames processed by the draw loop",
+            "# TYPE detection_frames_processed_total counter",
+            f"detection_frames_processed_total {self.frames_processed}",
+            "# HELP detection_capture_fps Frames per second delivered by the camera",
+            "# TYPE detection_capture_fps gauge",
+            f"detection_capture_fps {self.capture_fps:.3f}",
+            "# HELP detection_processed_fps Frames per second processed by the draw loop",
+            "# TYPE detection_processed_fps gauge",
+            f"detection_processed_fps {self.processed_fps:.3f}"
+        ]
+        for name, value in list(self.gauges.items()):
+            lines.append(f"# TYPE detection_{name} gauge")
+            lines.append(f"detection_{name} {value}")
+
+        lines.append("# HELP detection_stage_latency_seconds Latency of each pipeline stage")
+        lines.append("# TYPE detection_stage_latency_seconds histogram")
+        with self._lock:
+            for stage, histogram in self.histograms.items():
+                cumulative = 0
+                for bucket, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'detection_stage_latency_seconds_bucket{{stage="{stage}",le="{bucket:g}"}} {cumulative}')
+                lines.append(f'detection_stage_latency_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'detection_stage_latency_seconds_sum{{stage="{stage}"}} {histogram.total:.6f}')
+                lines.append(f'detection_stage_latency_seconds_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def start_server(self, host, port):
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            print(f"[Metrics Error] Failed to start metrics endpoint on {host}:{port}: {e}")
+            return
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        print(f"[Metrics Info] Serving metrics at http://{host}:{port}/metrics")
+
+    def stop_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
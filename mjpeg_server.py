@@ -0,0 +1,134 @@
+import threading
+import cv2
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BOUNDARY = "frame"
+
+class MJPEGServer:
+    def __init__(self, host, port, quality=80):
+        self.host = host
+        self.port = port
+        self.quality = quality
+        self.clients = 0
+        self.is_running = False
+        self.server = None
+        self.server_thread = None
+        self.encoder_thread = None
+        # double buffer: submit_frame fills _frame, the encoder swaps it with _encoding under the lock
+        self._frame = None
+        self._encoding = None
+        self._frame_seq = 0
+        self._jpeg = None
+        self._jpeg_seq = 0
+        self._frame_ready = threading.Condition()
+        self._jpeg_ready = threading.Condition()
+
+    def start(self):
+        preview = self
+
+        class StreamHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/":
+                    body = b'<html><body style="margin:0;background:#000"><img src="/stream"></body></html>'
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                elif self.path == "/stream":
+                    preview.serve_client(self)
+                else:
+                    self.send_error(404)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), StreamHandler)
+        except OSError as e:
+            print(f"[Preview Error] Failed to start MJPEG server on {self.host}:{self.port}: {e}")
+            return
+        self.server.daemon_threads = True
+        self.is_running = True
+        self.encoder_thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self.encoder_thread.start()
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+        print(f"[Preview Info] MJPEG preview at http://{self.host}:{self.port}/")
+
+    def stop(self):
+        self.is_running = False
+        with self._frame_ready:
+            self._frame_ready.notify_all()
+        with self._jpeg_ready:
+            self._jpeg_ready.notify_all()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.encoder_thread is not None:
+            self.encoder_thread.join(timeout=1.0)
+            self.encoder_thread = None
+
+    def submit_frame(self, frame):
+        # nobody is watching: skip the copy and the encode entirely
+        if not self.clients or frame is None:
+            return
+        with self._frame_ready:
+            if self._frame is None or self._frame.shape != frame.shape:
+                self._frame = np.empty_like(frame)
+            # copied so the draw loop can reuse its buffer while the encoder works
+            np.copyto(self._frame, frame)
+            self._frame_seq += 1
+            self._frame_ready.notify()
+
+    def _encode_loop(self):
+        encoded_seq = 0
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        while self.is_running:
+            with self._frame_ready:
+                while self.is_running and self._frame_seq == encoded_seq:
+                    self._frame_ready.wait(0.5)
+                if not self.is_running:
+                    return
+                encoded_seq = self._frame_seq
+                self._frame, self._encoding = self._encoding, self._frame
+            # encoded outside the lock, so the draw thread never waits on a JPEG encode
+            ok, jpeg = cv2.imencode(".jpg", self._encoding, params)
+            if not ok:
+                continue
+            with self._jpeg_ready:
+                self._jpeg = jpeg.tobytes()
+                self._jpeg_seq += 1
+                self._jpeg_ready.notify_all()
+
+    def serve_client(self, handler):
+        handler.send_response(200)
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        handler.end_headers()
+
+        with self._jpeg_ready:
+            self.clients += 1
+        sent_seq = 0
+        try:
+            while self.is_running:
+                with self._jpeg_ready:
+                    while self.is_running and self._jpeg_seq == sent_seq:
+                        self._jpeg_ready.wait(0.5)
+                    # a slow client jumps straight to the newest frame
+                    jpeg, sent_seq = self._jpeg, self._jpeg_seq
+                if jpeg is None:
+                    continue
+                handler.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode("ascii")
+                )
+                handler.wfile.write(jpeg)
+                handler.wfile.write(b"\r\n")
+                handler.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self._jpeg_ready:
+                self.clients -= 1
@@ -0,0 +1,63 @@
+import os
+from collections import OrderedDict
+
+class ModelManager:
+    def __init__(self, max_loaded_models=0, max_memory_mb=0, unload_on_disable=False):
+        self.max_loaded_models = max_loaded_models
+        self.max_memory_mb = max_memory_mb
+        self.unload_on_disable = unload_on_disable
+        # least recently used first
+        self.loaded = OrderedDict()
+
+    @staticmethod
+    def model_size_mb(detector):
+        try:
+            return os.path.getsize(detector.model_path) / (1024 * 1024)
+        except OSError:
+            return 0.0
+
+    def memory_mb(self):
+        return sum(self.model_size_mb(detector) for detector in self.loaded.values())
+
+    def _over_budget(self, extra_models=0, extra_mb=0.0):
+        if self.max_loaded_models and len(self.loaded) + extra_models > self.max_loaded_models:
+            return True
+        if self.max_memory_mb and self.memory_mb() + extra_mb > self.max_memory_mb:
+            return True
+        return False
+
+    def reserve(self, idx, detector):
+        if idx in self.loaded:
+            self.loaded.move_to_end(idx)
+            return
+        self._evict(extra_models=1, extra_mb=self.model_size_mb(detector))
+
+    def mark_loaded(self, idx, detector):
+        if detector.is_loaded:
+            self.loaded[idx] = detector
+            self.loaded.move_to_end(idx)
+
+    def release(self, idx, detector):
+        if self.unload_on_disable and idx in self.loaded:
+            self._unload(idx)
+
+    def _evict(self, extra_models=0, extra_mb=0.0):
+        for idx, detector in list(self.loaded.items()):
+            if not self._over_budget(extra_models, extra_mb):
+                return
+            # models of running detectors are never evicted
+            if detector.enabled:
+                continue
+            self._unload(idx)
+
+        if self._over_budget(extra_models, extra_mb):
+            print("[Model Manager] Model budget exceeded by enabled detectors")
+
+    def _unload(self, idx):
+        detector = self.loaded.pop(idx)
+        detector.unload()
+        print(f"[Model Manager] Unloaded model: {os.path.basename(detector.model_path)}")
+
+    def unload_all(self):
+        for idx in list(self.loaded):
+            self._unload(idx)
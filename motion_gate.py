@@ -0,0 +1,36 @@
+import cv2
+import numpy as np
+
+class MotionGate:
+    def __init__(self, downsample_size=(64, 48), pixel_threshold=12, changed_ratio=0.01, max_stale_frames=30):
+        self.downsample_size = downsample_size
+        self.pixel_threshold = pixel_threshold
+        self.changed_ratio = changed_ratio
+        self.max_stale_frames = max_stale_frames
+        self.reference = None
+        self.stale_frames = 0
+        self.skipped_frames = 0
+
+    def reset(self):
+        self.reference = None
+        self.stale_frames = 0
+
+    def has_changed(self, frame):
+        small = cv2.resize(frame, self.downsample_size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        if self.reference is not None and self.stale_frames < self.max_stale_frames:
+            diff = cv2.absdiff(gray, self.reference)
+            moved = np.count_nonzero(diff > self.pixel_threshold)
+            if moved <= self.changed_ratio * diff.size:
+                self.stale_frames += 1
+                self.skipped_frames += 1
+                return False
+
+        # compare against the frame the cached results came from, so slow drift still adds up
+        self.reference = gray
+        self.stale_frames = 0
+        return True
+
+    def report(self):
+        return f"Motion gate: skipped inference on {self.skipped_frames} static frames"
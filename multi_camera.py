@@ -0,0 +1,222 @@
+import os
+import time
+import queue
+import threading
+import multiprocessing as mp
+from config import CONFIG
+
+def _pin_to_cores(cores):
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        os.sched_setaffinity(0, cores)
+    except OSError as e:
+        print(f"[Stream Warning] Failed to pin to cores {cores}: {e}")
+
+def stream_worker(stream_index, stream_config, command_queue, status_queue):
+    # imported here so each spawned process builds its own OpenCV / MediaPipe state after pinning
+    _pin_to_cores(stream_config.get("cores"))
+    from camera import Camera
+    from detection_controller import DetectionController
+
+    name = stream_config["name"]
+    camera = Camera(camera_index=stream_config["source"], window_name=f"{CONFIG['camera']['window_name']} - {name}")
+    controller = DetectionController(camera=camera)
+    if controller.metrics_config.get("port", 0):
+        # one endpoint per stream, next to the supervisor's port
+        controller.metrics_config = dict(controller.metrics_config, port=controller.metrics_config["port"] + stream_index + 1)
+
+    if controller.publisher is not None:
+        controller.publisher.socket_path = f"{controller.publisher.socket_path}.{name}"
+
+    for detector_id in stream_config.get("detectors", []):
+        controller.toggle_detector("enable", detector_id)
+    if not controller.start():
+        status_queue.put({"name": name, "pid": os.getpid(), "state": "failed", "time": time.time()})
+        return
+
+    heartbeat_interval = CONFIG["streams"]["heartbeat_interval"]
+    try:
+        while controller.is_running and camera.is_running:
+            try:
+                command = command_queue.get(timeout=heartbeat_interval)
+            except queue.Empty:
+                command = None
+
+            if command is not None:
+                action, detector_id = command
+                if action == "exit":
+                    break
+                if detector_id in controller.detectors:
+                    controller.submit_command(action, detector_id)
+
+            status_queue.put({
+                "name": name,
+                "pid": os.getpid(),
+                "state": "running",
+                "time": time.time(),
+                "frames_processed": controller.scheduler.frame_index,
+                "frames_missed": controller.scheduler.missed_frames,
+                "frames_captured": camera.frame_seq,
+                "frames_dropped": camera.dropped_frames,
+                "enabled": [idx for idx, (n, detector) in controller.detectors.items() if detector.enabled]
+            })
+    finally:
+        controller.stop()
+        status_queue.put({"name": name, "pid": os.getpid(), "state": "stopped", "time": time.time()})
+
+class StreamSupervisor:
+    def __init__(self):
+        self.streams_config = CONFIG["streams"]
+        self.sources = self.streams_config["sources"]
+        self.heartbeat_timeout = self.streams_config["heartbeat_timeout"]
+        self.startup_timeout = self.streams_config.get("startup_timeout", 30.0)
+        self.restart_failed = self.streams_config.get("restart_failed", True)
+        self.exit_cmd = CONFIG["detection_controller"]["commands"]["exit_cmd"]
+        self.command_prompt = CONFIG["detection_controller"]["commands"]["prompt"]
+
+        # spawn keeps worker processes clear of the supervisor's threads and locks
+        self.context = mp.get_context("spawn")
+        self.status_queue = self.context.Queue()
+        # touched by the health thread and the prompt on the main thread
+        self.workers = {}
+        self.workers_lock = threading.Lock()
+        self.status = {}
+        self.is_running = False
+        self.health_thread = None
+
+    def _start_worker(self, stream_index):
+        stream_config = self.sources[stream_index]
+        command_queue = self.context.Queue()
+        process = self.context.Process(
+            target=stream_worker,
+            args=(stream_index, stream_config, command_queue, self.status_queue),
+            name=f"stream-{stream_config['name']}",
+            daemon=True
+        )
+        process.start()
+        with self.workers_lock:
+            self.workers[stream_config["name"]] = (stream_index, process, command_queue)
+        self.status[stream_config["name"]] = {"state": "starting", "time": time.time()}
+        print(f"[Supervisor Info] Started stream {stream_config['name']} (pid {process.pid}, cores {stream_config.get('cores')})")
+
+    def _health_loop(self):
+        while self.is_running:
+            try:
+                status = self.status_queue.get(timeout=1.0)
+                self.status[status["name"]] = status
+            except queue.Empty:
+                pass
+
+            now = time.time()
+            with self.workers_lock:
+                workers = list(self.workers.items())
+            for name, (stream_index, process, command_queue) in workers:
+                status = self.status.get(name, {})
+                if status.get("state") == "stopped" and not process.is_alive():
+                    # stopped on purpose (exit key in its window), not a crash
+                    print(f"\n[Supervisor Info] Stream {name} stopped")
+                    with self.workers_lock:
+                        self.workers.pop(name, None)
+                    continue
+                # model loading happens before the first heartbeat, give it longer
+                timeout = self.startup_timeout if status.get("state") == "starting" else self.heartbeat_timeout
+                stale = now - status.get("time", now) > timeout
+                if process.is_alive() and not stale:
+                    continue
+                if not self.is_running:
+                    break
+                print(f"\n[Supervisor Warning] Stream {name} is unhealthy (alive: {process.is_alive()}, stale: {stale})")
+                if process.is_alive():
+                    process.terminate()
+                process.join(timeout=1.0)
+                # a source that failed to open would fail again, only restart streams that died while running
+                if self.restart_failed and status.get("state") not in ("failed", "stopped"):
+                    self._start_worker(stream_index)
+                else:
+                    with self.workers_lock:
+                        self.workers.pop(name, None)
+
+    def send(self, action, detector_id, stream_name=None):
+        with self.workers_lock:
+            workers = list(self.workers.items())
+        for name, (stream_index, process, command_queue) in workers:
+            if stream_name is None or name == stream_name:
+                command_queue.put((action, detector_id))
+
+    def aggregate_metrics(self):
+        totals = {"frames_processed": 0, "frames_missed": 0, "frames_captured": 0, "frames_dropped": 0}
+        for status in self.status.values():
+            for key in totals:
+                totals[key] += status.get(key, 0)
+        return totals
+
+    def show_status(self):
+        print("\n--------------------------------------------------")
+        print("Stream Status:")
+        for name, status in self.status.items():
+            age = time.time() - status.get("time", time.time())
+            print(f"   {name} -- {status.get('state')} (pid {status.get('pid', '-')}, "
+                  f"frames {status.get('frames_processed', 0)}, dropped {status.get('frames_dropped', 0)}, "
+                  f"detectors {status.get('enabled', [])}, last seen {age:.1f}s ago)")
+        totals = self.aggregate_metrics()
+        print(f"   Total: {totals['frames_processed']} processed, {totals['frames_missed']} over budget, "
+              f"{totals['frames_captured']} captured, {totals['frames_dropped']} dropped")
+        print("--------------------------------------------------")
+
+    def parse_command(self, cmd):
+        cmd = cmd.strip()
+        if cmd.lower() == self.exit_cmd:
+            return ("exit", None, None)
+        if cmd.lower() == "status":
+            return ("status", None, None)
+
+        parts = cmd.split()
+        if len(parts) not in (2, 3) or parts[0].lower() not in ("enable", "disable"):
+            return None
+        try:
+            detector_id = int(parts[1])
+        except ValueError:
+            return None
+        stream_name = parts[2] if len(parts) == 3 else None
+        with self.workers_lock:
+            known = stream_name is None or stream_name in self.workers
+        if not known:
+            return None
+        return (parts[0].lower(), detector_id, stream_name)
+
+    def run(self):
+        print("=== Multi-Stream Visual Detection Program ===")
+        print(f"Commands:\n  Enable X [stream]\n  Disable X [stream]\n  status\n  {self.exit_cmd}\n")
+
+        self.is_running = True
+        for stream_index in range(len(self.sources)):
+            self._start_worker(stream_index)
+        self.health_thread = threading.Thread(target=self._health_loop, daemon=True)
+        self.health_thread.start()
+
+        while self.is_running:
+            parsed = self.parse_command(input(self.command_prompt))
+            if not parsed:
+                print("Invalid command! Try: Enable 2 / Enable 2 cam0 / Disable 3 / status / exit()")
+                continue
+
+            action, detector_id, stream_name = parsed
+            if action == "exit":
+                break
+            if action == "status":
+                self.show_status()
+                continue
+            self.send(action, detector_id, stream_name)
+
+        self.is_running = False
+        self.send("exit", None)
+        if self.health_thread is not None:
+            self.health_thread.join(timeout=2.0)
+        with self.workers_lock:
+            workers = list(self.workers.items())
+        for name, (stream_index, process, command_queue) in workers:
+            process.join(timeout=CONFIG["detection_controller"]["thread_timeout"] * 2)
+            if process.is_alive():
+                process.terminate()
+        print("\nAll streams stopped, program exited safely")
@@ -0,0 +1,62 @@
+import cv2
+import numpy as np
+
+class OverlayLayer:
+    def __init__(self):
+        self.image = None
+        self.mask = None
+        self.rect = (0, 0, 0, 0)
+        self.sources = []
+        self.frame_shape = None
+        self.built = False
+        self.direct_draws = 0
+        self.rebuilds = 0
+        self.reuses = 0
+
+    def _is_same(self, sources, frame_shape):
+        if frame_shape != self.frame_shape or len(sources) != len(self.sources):
+            return False
+        # cached results are reused as the same objects, so identity is enough to spot a change
+        return all(
+            idx == cached_idx and result is cached_result
+            for (idx, result), (cached_idx, cached_result) in zip(sources, self.sources)
+        )
+
+    def render(self, sources, frame, draw):
+        # draw(image) paints every annotation onto image and returns it
+        if not self._is_same(sources, frame.shape):
+            # fresh results: drawing them directly is cheaper than building a layer that may never be reused
+            self.sources = list(sources)
+            self.frame_shape = frame.shape
+            self.built = False
+            self.direct_draws += 1
+            return draw(frame)
+
+        if not self.built:
+            self._build(draw)
+        self.reuses += 1
+        x, y, w, h = self.rect
+        if w and h:
+            cv2.copyTo(self.image[y:y + h, x:x + w], self.mask[y:y + h, x:x + w], frame[y:y + h, x:x + w])
+        return frame
+
+    def _build(self, draw):
+        if self.image is None or self.image.shape != self.frame_shape:
+            self.image = np.zeros(self.frame_shape, dtype=np.uint8)
+        else:
+            # only the area painted last time needs clearing
+            x, y, w, h = self.rect
+            self.image[y:y + h, x:x + w] = 0
+        # unpainted (black) pixels stay transparent
+        draw(self.image)
+        gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        _, self.mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY)
+        self.rect = cv2.boundingRect(self.mask)
+        self.built = True
+        self.rebuilds += 1
+
+    def report(self):
+        return (
+            f"Overlay layer: {self.direct_draws} direct draws, "
+            f"rebuilt {self.rebuilds} times, composited {self.reuses} frames"
+        )
@@ -0,0 +1,88 @@
+MODEL_OPTIONS = ("model_path", "num_hands", "num_poses")
+
+class QualityController:
+    def __init__(self, ladder, target_fps, overload_ratio=1.0, headroom_ratio=0.6, window=30, cooldown=60):
+        # ladder entries: {"detector": id, <attribute>: value, ...}; level N has the first N entries applied
+        self.ladder = ladder
+        self.frame_budget = 1.0 / target_fps
+        self.overload_ratio = overload_ratio
+        self.headroom_ratio = headroom_ratio
+        self.window = window
+        self.cooldown = cooldown
+        self.level = 0
+        self.switches = 0
+        self.saved = {}
+        self._total = 0.0
+        self._frames = 0
+        self._cooldown_left = 0
+
+    def observe(self, frame_seconds, detectors):
+        if self._cooldown_left > 0:
+            # let the last switch settle (model reload, tracking restart) before judging it
+            self._cooldown_left -= 1
+            return
+        self._total += frame_seconds
+        self._frames += 1
+        if self._frames < self.window:
+            return
+
+        mean = self._total / self._frames
+        self._total = 0.0
+        self._frames = 0
+        # two separate thresholds, so a level that only just fits doesn't flip back and forth
+        if mean > self.frame_budget * self.overload_ratio and self.level < len(self.ladder):
+            self._step_down(detectors, mean)
+        elif mean < self.frame_budget * self.headroom_ratio and self.level > 0:
+            self._step_up(detectors, mean)
+
+    def _step_down(self, detectors, mean):
+        step = self.ladder[self.level]
+        name, detector = detectors[step["detector"]]
+        changes = {key: value for key, value in step.items() if key != "detector"}
+        saved = {key: getattr(detector, key) for key in changes}
+        self.level += 1
+        if not self._apply(detector, changes):
+            # the rebuilt model didn't load (e.g. lite model missing): put the old one back and skip the step
+            print(f"\n[Quality] {name} failed to load with {self._settings(changes)}, skipping this step")
+            self._apply(detector, saved)
+            self.saved[self.level - 1] = None
+            return
+        self.saved[self.level - 1] = saved
+        self._log("Overloaded", mean, name, changes)
+
+    def _step_up(self, detectors, mean):
+        self.level -= 1
+        step = self.ladder[self.level]
+        name, detector = detectors[step["detector"]]
+        changes = self.saved.pop(self.level)
+        if changes is None:
+            # this step was skipped on the way down
+            return
+        if not self._apply(detector, changes):
+            print(f"\n[Quality] {name} failed to reload with {self._settings(changes)}")
+        self._log("Headroom", mean, name, changes)
+
+    def _apply(self, detector, changes):
+        for key, value in changes.items():
+            if key == "inference_size" and isinstance(value, dict):
+                value = (value["width"], value["height"])
+            setattr(detector, key, value)
+        self.switches += 1
+        self._cooldown_left = self.cooldown
+        if (detector.enabled or detector.is_loaded) and any(key in MODEL_OPTIONS for key in changes):
+            # model options are baked into the task at creation, rebuild it with the new ones
+            return detector.reload()
+        return True
+
+    def _settings(self, changes):
+        return ", ".join(f"{key}={value}" for key, value in changes.items())
+
+    def _log(self, reason, mean, name, changes):
+        settings = self._settings(changes)
+        print(
+            f"\n[Quality] {reason} ({mean * 1000:.1f} ms/frame vs {self.frame_budget * 1000:.1f} ms budget): "
+            f"level {self.level}/{len(self.ladder)}, {name} -> {settings}"
+        )
+
+    def report(self):
+        return f"Quality controller: level {self.level}/{len(self.ladder)} after {self.switches} switches"
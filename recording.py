@@ -0,0 +1,191 @@
+import os
+import time
+import struct
+import numpy as np
+from camera import Camera
+
+MAGIC = b"VDREC001"
+# magic, width, height, channels, frame_count, fps
+HEADER_FORMAT = "<8sIIIQd"
+HEADER_SIZE = 64
+GROW_RECORDS = 256
+
+def record_dtype(width, height, channels=3):
+    return np.dtype([
+        ("seq", "<i8"),
+        ("timestamp", "<f8"),
+        ("frame", np.uint8, (height, width, channels))
+    ])
+
+def read_header(path):
+    with open(path, "rb") as f:
+        magic, width, height, channels, frame_count, fps = struct.unpack(
+            HEADER_FORMAT, f.read(struct.calcsize(HEADER_FORMAT))
+        )
+    if magic != MAGIC:
+        raise ValueError(f"Not a frame recording: {path}")
+    return width, height, channels, frame_count, fps
+
+class FrameRecorder:
+    def __init__(self, path, fps=30.0):
+        self.path = path
+        self.fps = fps
+        self.file = None
+        self.records = None
+        self.dtype = None
+        self.capacity = 0
+        self.frame_count = 0
+        self.width = self.height = self.channels = 0
+
+    def _write_header(self):
+        header = struct.pack(HEADER_FORMAT, MAGIC, self.width, self.height, self.channels, self.frame_count, self.fps)
+        self.file.seek(0)
+        self.file.write(header.ljust(HEADER_SIZE, b"\0"))
+        self.file.flush()
+
+    def _open(self, frame):
+        self.height, self.width = frame.shape[:2]
+        self.channels = frame.shape[2] if frame.ndim == 3 else 1
+        self.dtype = record_dtype(self.width, self.height, self.channels)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.file = open(self.path, "w+b")
+        self._write_header()
+        self._grow()
+        print(f"[Recorder Info] Recording {self.width}x{self.height} frames to {self.path}")
+
+    def _grow(self):
+        # the file is extended in chunks and remapped, appends are then plain memory copies
+        if self.records is not None:
+            self.records.flush()
+            del self.records
+        self.capacity += GROW_RECORDS
+        self.file.truncate(HEADER_SIZE + self.capacity * self.dtype.itemsize)
+        self.records = np.memmap(self.file, dtype=self.dtype, mode="r+", offset=HEADER_SIZE, shape=(self.capacity,))
+
+    def append(self, frame, timestamp, seq):
+        if self.file is None:
+            self._open(frame)
+        if frame.shape[:2] != (self.height, self.width):
+            print("[Recorder Warning] Frame size changed, frame skipped")
+            return
+        if self.frame_count >= self.capacity:
+            self._grow()
+
+        index = self.frame_count
+        self.records["seq"][index] = seq
+        self.records["timestamp"][index] = timestamp
+        self.records["frame"][index] = frame
+        self.frame_count += 1
+
+    def close(self):
+        if self.file is None:
+            return
+        self.records.flush()
+        del self.records
+        self.records = None
+        self.file.truncate(HEADER_SIZE + self.frame_count * self.dtype.itemsize)
+        self._write_header()
+        self.file.close()
+        self.file = None
+        print(f"[Recorder Info] Saved {self.frame_count} frames to {self.path}")
+
+class FrameRecording:
+    def __init__(self, path):
+        self.path = path
+        self.width, self.height, self.channels, frame_count, self.fps = read_header(path)
+        self.dtype = record_dtype(self.width, self.height, self.channels)
+        on_disk = (os.path.getsize(path) - HEADER_SIZE) // self.dtype.itemsize
+        if frame_count:
+            self.frame_count = min(frame_count, on_disk)
+        else:
+            # an unclean shutdown leaves the header count at 0 and the file padded with zeroed records
+            # up to the last grow; frame sequence numbers start at 1, so the last seq > 0 ends the recording
+            seqs = np.memmap(path, dtype=self.dtype, mode="r", offset=HEADER_SIZE, shape=(on_disk,))["seq"]
+            written = np.flatnonzero(seqs > 0)
+            self.frame_count = int(written[-1]) + 1 if len(written) else 0
+        self.records = np.memmap(path, dtype=self.dtype, mode="r", offset=HEADER_SIZE, shape=(self.frame_count,))
+
+    @property
+    def timestamps(self):
+        return self.records["timestamp"]
+
+    def __len__(self):
+        return self.frame_count
+
+    def close(self):
+        del self.records
+        self.records = None
+
+class ReplaySource(Camera):
+    def __init__(self, path, realtime=True, loop=False, max_frames=None, window_name=None):
+        super().__init__(camera_index=path, window_name=window_name)
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.max_frames = max_frames
+        self.threaded_capture = False
+        self.recording = None
+        self.position = 0
+        self._start_time = None
+
+    def start(self):
+        self.recording = FrameRecording(self.path)
+        if len(self.recording) == 0:
+            raise RuntimeError(f"Recording is empty: {self.path}")
+        self.resolution = {"width": self.recording.width, "height": self.recording.height}
+        self.fps = self.recording.fps
+        self.position = 0
+        self.frame_seq = 0
+        self.last_read_seq = 0
+        self.dropped_frames = 0
+        self._start_time = time.monotonic()
+        self.is_running = True
+        self._start_display()
+        mode = "original timing" if self.realtime else "as fast as possible"
+        print(f"Replaying {len(self.recording)} frames from {self.path} ({mode})")
+
+    def stop(self):
+        self.is_running = False
+        if self.recording is not None:
+            self.recording.close()
+            self.recording = None
+        self._stop_display()
+        print("Replay stopped")
+
+    def get_latest(self, timeout=None):
+        if not self.is_running or self.recording is None:
+            return None, None, None
+        if self.max_frames is not None and self.frame_seq >= self.max_frames:
+            self.is_running = False
+            return None, None, None
+        if self.position >= len(self.recording):
+            if not self.loop:
+                self.is_running = False
+                return None, None, None
+            self.position = 0
+            self._start_time = time.monotonic()
+
+        timestamps = self.recording.timestamps
+        if self.realtime:
+            due = self._start_time + (timestamps[self.position] - timestamps[0])
+            now = time.monotonic()
+            if due > now:
+                time.sleep(due - now)
+            else:
+                # behind schedule: skip to the newest frame that is already due, like a live camera would
+                elapsed = now - self._start_time + timestamps[0]
+                newest = int(np.searchsorted(timestamps, elapsed, side="right")) - 1
+                if newest > self.position:
+                    self.dropped_frames += newest - self.position
+                    self.position = newest
+
+        # the frame is a read-only view into the mapping, no decode and no copy
+        frame = self.recording.records["frame"][self.position]
+        timestamp = float(timestamps[self.position])
+        self.position += 1
+        self.frame_seq += 1
+        self.last_read_seq = self.frame_seq
+        return frame, timestamp, self.frame_seq
+
+    def get_frame(self):
+        return self.get_latest()[0]
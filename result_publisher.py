@@ -0,0 +1,145 @@
+import os
+import socket
+import struct
+import threading
+from collections import deque
+import numpy as np
+
+MAGIC = b"VDR1"
+# magic, frame_id, timestamp, face count, hand count, pose count
+RECORD_HEADER = struct.Struct("<4sqdHHH")
+LENGTH_PREFIX = struct.Struct("<I")
+HAND_LANDMARKS = 21
+POSE_LANDMARKS = 33
+
+def encode_record(frame_id, timestamp, arrays):
+    face = arrays.get("face")
+    if face is not None:
+        faces = np.hstack([face["boxes"], face["scores"][:, None]]).astype(np.float32, copy=False)
+    else:
+        faces = np.zeros((0, 5), dtype=np.float32)
+    hands = arrays["hand"]["landmarks"] if "hand" in arrays else np.zeros((0, HAND_LANDMARKS, 3), np.float32)
+    poses = arrays["pose"]["landmarks"] if "pose" in arrays else np.zeros((0, POSE_LANDMARKS, 3), np.float32)
+
+    body = b"".join((
+        RECORD_HEADER.pack(MAGIC, frame_id, timestamp, len(faces), len(hands), len(poses)),
+        np.ascontiguousarray(faces, dtype="<f4").tobytes(),
+        np.ascontiguousarray(hands, dtype="<f4").tobytes(),
+        np.ascontiguousarray(poses, dtype="<f4").tobytes()
+    ))
+    return LENGTH_PREFIX.pack(len(body)) + body
+
+def decode_record(body):
+    magic, frame_id, timestamp, n_faces, n_hands, n_poses = RECORD_HEADER.unpack_from(body)
+    if magic != MAGIC:
+        raise ValueError("Invalid detection record")
+    offset = RECORD_HEADER.size
+    faces = np.frombuffer(body, dtype="<f4", count=n_faces * 5, offset=offset).reshape(n_faces, 5)
+    offset += faces.nbytes
+    hands = np.frombuffer(body, dtype="<f4", count=n_hands * HAND_LANDMARKS * 3, offset=offset)
+    hands = hands.reshape(n_hands, HAND_LANDMARKS, 3)
+    offset += hands.nbytes
+    poses = np.frombuffer(body, dtype="<f4", count=n_poses * POSE_LANDMARKS * 3, offset=offset)
+    poses = poses.reshape(n_poses, POSE_LANDMARKS, 3)
+    return {"frame_id": frame_id, "timestamp": timestamp, "faces": faces, "hands": hands, "poses": poses}
+
+def subscribe(socket_path):
+    # minimal consumer: yields decoded records as they arrive
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(socket_path)
+    stream = client.makefile("rb")
+    try:
+        while True:
+            prefix = stream.read(LENGTH_PREFIX.size)
+            if len(prefix) < LENGTH_PREFIX.size:
+                return
+            (length,) = LENGTH_PREFIX.unpack(prefix)
+            yield decode_record(stream.read(length))
+    finally:
+        stream.close()
+        client.close()
+
+class Subscriber:
+    def __init__(self, conn, max_queue):
+        self.conn = conn
+        self.queue = deque(maxlen=max_queue)
+        self.dropped = 0
+        self.is_open = True
+
+class ResultPublisher:
+    def __init__(self, socket_path, max_queue=64, batch_size=8):
+        self.socket_path = socket_path
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.subscribers = []
+        self.server = None
+        self.is_running = False
+        self._ready = threading.Condition()
+        self.accept_thread = None
+
+    @property
+    def has_subscribers(self):
+        return bool(self.subscribers)
+
+    def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_path)
+        self.server.listen()
+        self.is_running = True
+        self.accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self.accept_thread.start()
+        print(f"[Publisher Info] Publishing detections on {self.socket_path}")
+
+    def stop(self):
+        self.is_running = False
+        with self._ready:
+            for subscriber in self.subscribers:
+                subscriber.is_open = False
+            self._ready.notify_all()
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _accept_loop(self):
+        while self.is_running:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                break
+            subscriber = Subscriber(conn, self.max_queue)
+            with self._ready:
+                self.subscribers.append(subscriber)
+            threading.Thread(target=self._send_loop, args=(subscriber,), daemon=True).start()
+
+    def _send_loop(self, subscriber):
+        try:
+            while subscriber.is_open:
+                with self._ready:
+                    while subscriber.is_open and not subscriber.queue:
+                        self._ready.wait()
+                    batch = [subscriber.queue.popleft() for _ in range(min(self.batch_size, len(subscriber.queue)))]
+                if batch:
+                    subscriber.conn.sendall(b"".join(batch))
+        except OSError:
+            pass
+        finally:
+            with self._ready:
+                if subscriber in self.subscribers:
+                    self.subscribers.remove(subscriber)
+            subscriber.conn.close()
+
+    def publish(self, frame_id, timestamp, arrays):
+        if not self.subscribers:
+            return
+        record = encode_record(frame_id, timestamp, arrays)
+        with self._ready:
+            for subscriber in self.subscribers:
+                # deque(maxlen) drops the oldest record for a client that can't keep up
+                if len(subscriber.queue) == subscriber.queue.maxlen:
+                    subscriber.dropped += 1
+                subscriber.queue.append(record)
+            self._ready.notify_all()
@@ -0,0 +1,81 @@
+import numpy as np
+from utils import merge_results, get_mediapipe
+
+# pose landmark indices: (wrist, elbow) per arm, and nose..mouth for the face
+ARM_LANDMARKS = ((15, 13), (16, 14))
+FACE_LANDMARKS = list(range(11))
+
+class PoseCascade:
+    def __init__(self, config):
+        self.pose_id = config["pose_detector"]
+        self.targets = {config["hand_detector"]: "hand", config["face_detector"]: "face"}
+        self.min_visibility = config.get("min_visibility", 0.3)
+        self.hand_scale = config.get("hand_scale", 1.6)
+        self.face_scale = config.get("face_scale", 2.0)
+        self.min_crop_size = config.get("min_crop_size", 64)
+
+    def split(self, scheduled):
+        direct = [(idx, detector) for idx, detector in scheduled if idx not in self.targets]
+        cascaded = [(idx, detector) for idx, detector in scheduled if idx in self.targets]
+        return direct, cascaded
+
+    def _square(self, center_x, center_y, side, frame_size):
+        frame_height, frame_width = frame_size
+        side = max(side, self.min_crop_size)
+        x0 = int(max(center_x - side / 2, 0))
+        y0 = int(max(center_y - side / 2, 0))
+        x1 = int(min(center_x + side / 2, frame_width))
+        y1 = int(min(center_y + side / 2, frame_height))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        return x0, y0, x1, y1
+
+    def rois(self, pose_result, frame_size):
+        rois = {"hand": [], "face": []}
+        if not pose_result or not pose_result.pose_landmarks:
+            return rois
+
+        frame_height, frame_width = frame_size
+        for pose_landmarks in pose_result.pose_landmarks:
+            points = np.array(
+                [(lm.x * frame_width, lm.y * frame_height, lm.visibility or 0.0) for lm in pose_landmarks],
+                dtype=np.float32
+            )
+
+            for wrist_idx, elbow_idx in ARM_LANDMARKS:
+                wrist, elbow = points[wrist_idx], points[elbow_idx]
+                if wrist[2] < self.min_visibility:
+                    continue
+                forearm = wrist[:2] - elbow[:2]
+                # the hand sits beyond the wrist along the forearm direction
+                center = wrist[:2] + forearm * 0.5
+                roi = self._square(center[0], center[1], np.hypot(*forearm) * self.hand_scale, frame_size)
+                if roi is not None:
+                    rois["hand"].append(roi)
+
+            face = points[FACE_LANDMARKS]
+            face = face[face[:, 2] >= self.min_visibility]
+            if len(face):
+                span = max(np.ptp(face[:, 0]), np.ptp(face[:, 1]))
+                center = face[:, :2].mean(axis=0)
+                roi = self._square(center[0], center[1], span * self.face_scale, frame_size)
+                if roi is not None:
+                    rois["face"].append(roi)
+        return rois
+
+    def detect(self, detector, kind, packet, rois):
+        frame_size = packet.frame.shape[:2]
+        if not rois[kind]:
+            # no pose guidance for this target: fall back to the full frame
+            return packet.detect(detector)
+
+        mp = get_mediapipe()
+        rgb = packet.mp_image.numpy_view()
+        results = []
+        for roi in rois[kind]:
+            x0, y0, x1, y1 = roi
+            crop = np.ascontiguousarray(rgb[y0:y1, x0:x1])
+            crop_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=crop)
+            result = detector.detect(crop_image, packet.timestamp_ms)
+            results.append(detector.remap_result(result, roi, (x1 - x0, y1 - y0), frame_size))
+        return merge_results(results, detector.RESULT_LISTS)
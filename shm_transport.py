@@ -0,0 +1,257 @@
+import sys
+import time
+import queue
+import cv2
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+# slot states
+FREE, WRITING, READY = 0, 1, 2
+# per-slot metadata columns; HOLDERS has bit (1 << detector id) set for every worker still reading the slot
+STATE, HOLDERS, FRAME_ID = 0, 1, 2
+
+class SharedFrameRing:
+    def __init__(self, num_slots, frame_shape, name=None):
+        self.num_slots = num_slots
+        self.frame_shape = tuple(frame_shape)
+        self.owner = name is None
+
+        meta_bytes = num_slots * 3 * np.dtype(np.int64).itemsize
+        frame_bytes = int(np.prod(self.frame_shape))
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=meta_bytes + num_slots * frame_bytes)
+        else:
+            # spawned workers share the parent's resource tracker, which keeps the block registered for
+            # crash-time cleanup; 3.13+ can skip registering the attachment at all
+            if sys.version_info >= (3, 13):
+                self.shm = shared_memory.SharedMemory(name=name, track=False)
+            else:
+                self.shm = shared_memory.SharedMemory(name=name)
+
+        self.meta = np.ndarray((num_slots, 3), dtype=np.int64, buffer=self.shm.buf)
+        self.frames = np.ndarray((num_slots,) + self.frame_shape, dtype=np.uint8, buffer=self.shm.buf, offset=meta_bytes)
+        if self.owner:
+            self.meta[:] = 0
+
+    @property
+    def spec(self):
+        return self.shm.name, self.num_slots, self.frame_shape
+
+    @classmethod
+    def attach(cls, spec):
+        name, num_slots, frame_shape = spec
+        return cls(num_slots, frame_shape, name=name)
+
+    def acquire(self, lock):
+        with lock:
+            free = np.flatnonzero(self.meta[:, STATE] == FREE)
+            if len(free) == 0:
+                return None
+            slot = int(free[0])
+            self.meta[slot, STATE] = WRITING
+            return slot
+
+    def publish(self, slot, readers, frame_id, lock):
+        holders = 0
+        for reader in readers:
+            holders |= 1 << reader
+        with lock:
+            self.meta[slot, FRAME_ID] = frame_id
+            self.meta[slot, HOLDERS] = holders
+            self.meta[slot, STATE] = READY if holders else FREE
+
+    def release(self, slot, reader, lock):
+        with lock:
+            self.meta[slot, HOLDERS] &= ~(1 << reader)
+            if self.meta[slot, HOLDERS] == 0:
+                self.meta[slot, STATE] = FREE
+
+    def release_reader(self, reader, lock):
+        # hand back every slot a dead or terminated worker still held
+        with lock:
+            held = (self.meta[:, HOLDERS] & (1 << reader)) != 0
+            self.meta[held, HOLDERS] &= ~(1 << reader)
+            self.meta[held & (self.meta[:, HOLDERS] == 0), STATE] = FREE
+
+    def close(self):
+        # numpy views must go before the mapping can be closed
+        self.meta = None
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def detector_worker(idx, class_name, ring_spec, task_queue, result_queue, lock):
+    from detector_registry import create_detector
+    import mediapipe as mp_tasks
+
+    ring = SharedFrameRing.attach(ring_spec)
+    detector = create_detector(class_name)
+    detector.enable()
+    frame_height, frame_width = ring.frame_shape[:2]
+
+    try:
+        while True:
+            task = task_queue.get()
+            # a slow worker skips to the newest frame and hands the older slots straight back
+            while task is not None:
+                try:
+                    newer = task_queue.get_nowait()
+                except queue.Empty:
+                    break
+                ring.release(task[0], idx, lock)
+                task = newer
+            if task is None:
+                break
+
+            slot, frame_id, timestamp_ms = task
+            try:
+                try:
+                    rgb = ring.frames[slot]
+                    size = detector.inference_size
+                    if size is not None and (size[0] < frame_width or size[1] < frame_height):
+                        rgb = cv2.resize(rgb, size, interpolation=cv2.INTER_AREA)
+                    mp_image = mp_tasks.Image(image_format=mp_tasks.ImageFormat.SRGB, data=rgb)
+                finally:
+                    # mp.Image holds its own copy of the pixels, the slot can go back before inference
+                    ring.release(slot, idx, lock)
+                result = detector.detect(mp_image, timestamp_ms)
+            except Exception as e:
+                print(f"[Worker Error] Detector {idx} inference failed: {e}")
+                result = None
+
+            if result is not None and mp_image.width != frame_width:
+                if result is not detector.remapped_result:
+                    detector.remap_result(result, (0, 0, frame_width, frame_height),
+                                          (mp_image.width, mp_image.height), (frame_height, frame_width))
+                    detector.remapped_result = result
+            result_queue.put((frame_id, idx, detector.to_arrays(result)))
+    finally:
+        detector.unload()
+        ring.close()
+
+class ProcessDetectorPool:
+    def __init__(self, detector_classes, num_slots=4, result_timeout=0.1, max_restarts=5, restart_delay=0.5):
+        self.detector_classes = detector_classes
+        self.num_slots = num_slots
+        self.result_timeout = result_timeout
+        self.max_restarts = max_restarts
+        self.restart_delay = restart_delay
+        # detector id -> (consecutive worker exits, monotonic time of the next start attempt)
+        self.restarts = {}
+        # detectors whose worker kept exiting; they get no more workers until reset_worker()
+        self.failed = set()
+        self.context = mp.get_context("spawn")
+        self.lock = self.context.Lock()
+        self.result_queue = self.context.Queue()
+        self.workers = {}
+        self.ring = None
+        self.dropped_frames = 0
+
+    def _ensure_ring(self, frame_shape):
+        if self.ring is not None and self.ring.frame_shape == tuple(frame_shape):
+            return
+        # a resolution change invalidates every slot, restart the workers on a fresh ring
+        self.stop_workers()
+        if self.ring is not None:
+            self.ring.close()
+        self.ring = SharedFrameRing(self.num_slots, frame_shape)
+
+    def ensure_worker(self, idx):
+        # returns whether the detector has a running worker to send frames to
+        worker = self.workers.get(idx)
+        if worker is not None and worker[0].is_alive():
+            return True
+        if idx in self.failed:
+            return False
+        if worker is not None:
+            del self.workers[idx]
+            self.ring.release_reader(idx, self.lock)
+            # a worker that dies at startup would otherwise be respawned every frame
+            exits = self.restarts.get(idx, (0, 0.0))[0] + 1
+            if exits > self.max_restarts:
+                print(f"[Process Pool] Detector {idx} worker exited {exits} times in a row "
+                      f"(code {worker[0].exitcode}), giving up")
+                self.restarts.pop(idx, None)
+                self.failed.add(idx)
+                return False
+            delay = self.restart_delay * 2 ** (exits - 1)
+            print(f"[Process Pool] Detector {idx} worker exited (code {worker[0].exitcode}), restarting in {delay:.1f}s")
+            self.restarts[idx] = (exits, time.monotonic() + delay)
+        if time.monotonic() < self.restarts.get(idx, (0, 0.0))[1]:
+            return False
+
+        task_queue = self.context.Queue()
+        process = self.context.Process(
+            target=detector_worker,
+            args=(idx, self.detector_classes[idx], self.ring.spec, task_queue, self.result_queue, self.lock),
+            name=f"detector-{idx}",
+            daemon=True
+        )
+        process.start()
+        self.workers[idx] = (process, task_queue)
+        return True
+
+    def reset_worker(self, idx):
+        # a detector enabled again by hand gets a fresh set of restart attempts
+        self.failed.discard(idx)
+        self.restarts.pop(idx, None)
+
+    def stop_worker(self, idx):
+        worker = self.workers.pop(idx, None)
+        if worker is None:
+            return
+        process, task_queue = worker
+        task_queue.put(None)
+        process.join(timeout=2.0)
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout=1.0)
+        if self.ring is not None:
+            self.ring.release_reader(idx, self.lock)
+
+    def stop_workers(self):
+        for idx in list(self.workers):
+            self.stop_worker(idx)
+
+    def process(self, frame, frame_id, timestamp_ms, indices):
+        self._ensure_ring(frame.shape)
+        indices = [idx for idx in indices if self.ensure_worker(idx)]
+        if not indices:
+            return {}
+
+        slot = self.ring.acquire(self.lock)
+        if slot is None:
+            # every slot is still held by a worker: drop this frame instead of queueing more memory
+            self.dropped_frames += 1
+            return {}
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.ring.frames[slot])
+        self.ring.publish(slot, indices, frame_id, self.lock)
+        for idx in indices:
+            self.workers[idx][1].put((slot, frame_id, timestamp_ms))
+
+        results = {}
+        deadline = time.monotonic() + self.result_timeout
+        pending = set(indices)
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                result_frame_id, idx, arrays = self.result_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            # late results of earlier frames are still the newest ones for their detector
+            results[idx] = arrays
+            # a worker that delivers results is healthy again
+            self.restarts.pop(idx, None)
+            if result_frame_id == frame_id:
+                pending.discard(idx)
+        return results
+
+    def close(self):
+        self.stop_workers()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
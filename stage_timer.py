@@ -0,0 +1,26 @@
+import numpy as np
+from collections import defaultdict
+
+class StageTimer:
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def record(self, stage, seconds):
+        self.samples[stage].append(seconds)
+
+    def reset(self):
+        self.samples = defaultdict(list)
+
+    def summary(self):
+        summary = {}
+        for stage, samples in self.samples.items():
+            values_ms = np.asarray(samples, dtype=np.float64) * 1000
+            p50, p95, p99 = np.percentile(values_ms, [50, 95, 99])
+            summary[stage] = {
+                "count": int(values_ms.size),
+                "mean_ms": float(values_ms.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99)
+            }
+        return summary
@@ -0,0 +1,84 @@
+import itertools
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tracker import GATED_COST, ObjectTracker, linear_assignment, _shortest_augmenting_path
+
+def brute_force_cost(cost):
+    n_rows, n_cols = cost.shape
+    if n_rows <= n_cols:
+        return min(
+            cost[np.arange(n_rows), list(cols)].sum()
+            for cols in itertools.permutations(range(n_cols), n_rows)
+        )
+    return min(
+        cost[list(rows), np.arange(n_cols)].sum()
+        for rows in itertools.permutations(range(n_rows), n_cols)
+    )
+
+def test_linear_assignment_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for trial in range(300):
+        n_rows, n_cols = (int(n) for n in rng.integers(1, 7, 2))
+        cost = rng.random((n_rows, n_cols))
+        if trial % 3 == 0:
+            # many ties
+            cost = np.round(cost * 3)
+        rows, cols = linear_assignment(cost)
+        assert len(rows) == min(n_rows, n_cols)
+        assert len(set(rows.tolist())) == len(rows) and len(set(cols.tolist())) == len(cols)
+        assert np.isclose(cost[rows, cols].sum(), brute_force_cost(cost))
+
+def test_shortest_augmenting_path_on_conflicting_rows():
+    # every row prefers column 0, so the fast path can't be used
+    cost = np.array([[0.0, 5.0, 9.0], [1.0, 2.0, 9.0], [1.0, 9.0, 3.0]])
+    rows, cols = _shortest_augmenting_path(cost)
+    assert np.isclose(cost[rows, cols].sum(), brute_force_cost(cost))
+
+def test_linear_assignment_with_mostly_gated_pairs():
+    rng = np.random.default_rng(2)
+    max_cost = 0.5
+    for trial in range(200):
+        n_rows, n_cols = (int(n) for n in rng.integers(1, 9, 2))
+        cost = rng.random((n_rows, n_cols))
+        # most pairs are out of reach, as when tracks and detections turn over
+        cost[rng.random((n_rows, n_cols)) < 0.7] = GATED_COST
+        rows, cols = linear_assignment(cost, max_cost)
+        assert (cost[rows, cols] <= max_cost).all()
+        assert len(set(rows.tolist())) == len(rows) and len(set(cols.tolist())) == len(cols)
+        # same number of real matches and the same cost as solving the whole padded matrix
+        dense_rows, dense_cols = linear_assignment(np.where(cost <= max_cost, cost, GATED_COST))
+        kept = cost[dense_rows, dense_cols] <= max_cost
+        assert len(rows) == kept.sum()
+        assert np.isclose(cost[rows, cols].sum(), cost[dense_rows, dense_cols][kept].sum())
+
+def test_linear_assignment_scene_cut():
+    rows, cols = linear_assignment(np.full((60, 30), GATED_COST), 0.5)
+    assert len(rows) == 0 and len(cols) == 0
+
+def test_linear_assignment_empty():
+    rows, cols = linear_assignment(np.zeros((0, 3)))
+    assert len(rows) == 0 and len(cols) == 0
+
+def test_tracker_keeps_ids_for_moving_boxes():
+    tracker = ObjectTracker("face", max_cost=0.7)
+    boxes = np.array([[10, 10, 50, 50], [200, 200, 50, 50]], dtype=np.float32)
+    scores = np.ones(2, dtype=np.float32)
+    first = tracker.update({"boxes": boxes, "scores": scores}, 0.0)
+    # detections come back in the opposite order, slightly moved
+    moved = boxes[::-1] + 5
+    second = tracker.update({"boxes": moved, "scores": scores}, 0.1)
+    assert second.tolist() == first[::-1].tolist()
+
+def test_tracker_matches_landmarks_on_anchor_landmarks():
+    rng = np.random.default_rng(1)
+    poses = rng.random((3, 33, 3)).astype(np.float32) * 0.1
+    poses[:, :, 0] += np.array([0.1, 0.45, 0.8], dtype=np.float32)[:, None]
+    tracker = ObjectTracker("pose", max_cost=0.1)
+    first = tracker.update({"landmarks": poses}, 0.0)
+    second = tracker.update({"landmarks": poses[[2, 0, 1]] + 0.01}, 0.1)
+    assert second.tolist() == first[[2, 0, 1]].tolist()
@@ -0,0 +1,293 @@
+import numpy as np
+from utils import draw_text_labels
+
+# padding cost for gated pairs; any assignment using it is thrown away afterwards
+GATED_COST = 1e6
+
+# which array of a detector's to_arrays() output is tracked, and how candidates are compared
+TRACKED_ARRAYS = {
+    "face": ("boxes", "iou"),
+    "hand": ("landmarks", "keypoints"),
+    "pose": ("landmarks", "keypoints")
+}
+# landmarks compared when matching: wrist, fingertips and outer knuckles / head, shoulders, elbows, hips, knees
+ANCHOR_LANDMARKS = {
+    "hand": [0, 4, 5, 8, 12, 16, 17, 20],
+    "pose": [0, 11, 12, 13, 14, 23, 24, 25, 26]
+}
+
+def box_iou_cost(tracks, detections, max_cost=None):
+    # (T, 4) x (N, 4) xywh boxes -> (T, N) matrix of 1 - IoU; cheap enough to need no gate
+    tx1, ty1 = tracks[:, 0:1], tracks[:, 1:2]
+    tx2, ty2 = tx1 + tracks[:, 2:3], ty1 + tracks[:, 3:4]
+    dx1, dy1 = detections[:, 0], detections[:, 1]
+    dx2, dy2 = dx1 + detections[:, 2], dy1 + detections[:, 3]
+
+    inter_w = np.clip(np.minimum(tx2, dx2) - np.maximum(tx1, dx1), 0, None)
+    inter_h = np.clip(np.minimum(ty2, dy2) - np.maximum(ty1, dy1), 0, None)
+    inter = inter_w * inter_h
+    union = tracks[:, 2:3] * tracks[:, 3:4] + detections[:, 2] * detections[:, 3] - inter
+    return 1.0 - inter / np.maximum(union, 1e-6)
+
+def keypoint_distance_cost(tracks, detections, max_cost=None):
+    # (T, K, 2) x (N, K, 2) normalized x/y landmarks -> (T, N) mean distance per landmark
+    track_centers = tracks.mean(axis=1)
+    detection_centers = detections.mean(axis=1)
+    offsets = track_centers[:, None] - detection_centers[None]
+    center_distance = np.hypot(offsets[..., 0], offsets[..., 1])
+
+    # the centroid distance never exceeds the mean landmark distance, so it is an exact gate:
+    # only pairs that pass it get the full per-landmark comparison
+    cost = np.full(center_distance.shape, GATED_COST, dtype=np.float32)
+    rows, cols = np.nonzero(center_distance <= max_cost) if max_cost is not None else np.indices(cost.shape).reshape(2, -1)
+    if len(rows):
+        diff = tracks[rows] - detections[cols]
+        cost[rows, cols] = np.hypot(diff[..., 0], diff[..., 1]).mean(axis=-1)
+    return cost
+
+COST_FUNCTIONS = {
+    "iou": box_iou_cost,
+    "keypoints": keypoint_distance_cost
+}
+
+def linear_assignment(cost, max_cost=None):
+    # minimum-cost matching of rows to columns; returns (rows, cols) index arrays.
+    # with max_cost, only pairs within it can be matched: rows and columns without such a pair are
+    # left out, and when rows compete, each connected group of candidate pairs is solved on its own
+    cost = np.asarray(cost, dtype=np.float64)
+    if max_cost is None:
+        return _solve_dense(cost)
+    allowed = cost <= max_cost
+    rows = np.flatnonzero(allowed.any(axis=1))
+    cols = np.flatnonzero(allowed.any(axis=0))
+    if not len(rows):
+        return rows, cols
+    allowed = allowed[np.ix_(rows, cols)]
+    cost = np.where(allowed, cost[np.ix_(rows, cols)], GATED_COST)
+    sub_rows, sub_cols = _solve_dense(cost, fast_only=True)
+    if sub_rows is None:
+        sub_rows, sub_cols = _solve_groups(cost, allowed)
+    keep = allowed[sub_rows, sub_cols]
+    return rows[sub_rows[keep]], cols[sub_cols[keep]]
+
+def _solve_groups(cost, allowed):
+    # groups of rows and columns linked by candidate pairs can't affect each other's matching
+    row_labels, col_labels = _connected_components(allowed)
+    matched_rows, matched_cols = [], []
+    for label in np.unique(row_labels).tolist():
+        group_rows = np.flatnonzero(row_labels == label)
+        group_cols = np.flatnonzero(col_labels == label)
+        sub_rows, sub_cols = _solve_dense(cost[np.ix_(group_rows, group_cols)])
+        matched_rows.append(group_rows[sub_rows])
+        matched_cols.append(group_cols[sub_cols])
+    rows, cols = np.concatenate(matched_rows), np.concatenate(matched_cols)
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+def _connected_components(allowed):
+    # label propagation over the bipartite graph of candidate pairs, where every row and column has
+    # at least one pair; each group ends up labelled with its lowest row index
+    n_rows = allowed.shape[0]
+    row_labels = np.arange(n_rows)
+    while True:
+        col_labels = np.where(allowed, row_labels[:, None], n_rows).min(axis=0)
+        labels = np.where(allowed, col_labels, n_rows).min(axis=1)
+        if (labels == row_labels).all():
+            return row_labels, col_labels
+        row_labels = labels
+
+def _solve_dense(cost, fast_only=False):
+    if cost.size == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n_rows, n_cols = cost.shape
+
+    # common case: every row's cheapest column is distinct, which is already optimal
+    best = cost.argmin(axis=1)
+    if np.unique(best).size == n_rows:
+        rows, cols = np.arange(n_rows), best
+    elif fast_only:
+        return None, None
+    else:
+        rows, cols = _shortest_augmenting_path(cost)
+
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+def _shortest_augmenting_path(cost):
+    # Hungarian method (rows <= cols) with the per-column relaxation done as array operations;
+    # index 0 of the column arrays is a virtual column holding the row being inserted
+    n_rows, n_cols = cost.shape
+    if n_rows < n_cols:
+        # square it up with constant dummy rows, which shift every complete matching by the same amount
+        cost = np.vstack([cost, np.full((n_cols - n_rows, n_cols), cost.max())])
+    n = n_cols
+    u = np.zeros(n + 1)
+    v = np.zeros(n + 1)
+    owner = np.zeros(n + 1, dtype=np.intp)
+    way = np.zeros(n + 1, dtype=np.intp)
+
+    # column reduction: v = column minima keeps every reduced cost >= 0 and gives most rows
+    # a zero-cost column up front, so only the remaining rows need an augmenting path
+    v[1:] = cost.min(axis=0)
+    best_rows = cost.argmin(axis=0)
+    assigned = np.zeros(n, dtype=bool)
+    for col in range(n - 1, -1, -1):
+        row = best_rows[col]
+        if not assigned[row]:
+            assigned[row] = True
+            owner[col + 1] = row + 1
+
+    for row in (np.flatnonzero(~assigned) + 1).tolist():
+        owner[0] = row
+        col = 0
+        min_reduced = np.full(n + 1, np.inf)
+        used = np.zeros(n + 1, dtype=bool)
+        while True:
+            used[col] = True
+            current = owner[col]
+            reduced = cost[current - 1] - u[current] - v[1:]
+            free = ~used[1:]
+            improved = free & (reduced < min_reduced[1:])
+            min_reduced[1:][improved] = reduced[improved]
+            way[1:][improved] = col
+
+            candidates = np.where(free, min_reduced[1:], np.inf)
+            next_col = int(candidates.argmin()) + 1
+            delta = candidates[next_col - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_reduced[1:][free] -= delta
+
+            col = next_col
+            if owner[col] == 0:
+                break
+
+        while col:
+            previous = way[col]
+            owner[col] = owner[previous]
+            col = previous
+
+    rows = owner[1:] - 1
+    real = rows < n_rows
+    return rows[real], np.flatnonzero(real)
+
+class ObjectTracker:
+    def __init__(self, result_key, max_cost, max_missed=5, velocity_smoothing=0.5):
+        self.state_key, metric = TRACKED_ARRAYS[result_key]
+        self.anchors = ANCHOR_LANDMARKS.get(result_key)
+        self.cost_function = COST_FUNCTIONS[metric]
+        self.max_cost = max_cost
+        self.max_missed = max_missed
+        self.velocity_smoothing = velocity_smoothing
+        self.next_id = 1
+        self.reset()
+
+    def reset(self):
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.arrays = None
+        self.velocities = None
+        self.missed = np.zeros(0, dtype=np.int32)
+        self.last_timestamp = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def predict(self, timestamp):
+        # constant-velocity positions of every live track at the given time
+        if not len(self):
+            return None
+        dt = 0.0 if self.last_timestamp is None else max(timestamp - self.last_timestamp, 0.0)
+        states = self.arrays[self.state_key]
+        return (states + self.velocities * dt).astype(states.dtype, copy=False)
+
+    def update(self, arrays, timestamp):
+        # match fresh detections to tracks; returns one track ID per detection, in detection order
+        states = arrays[self.state_key]
+        num_detections = len(states)
+        detection_ids = np.zeros(num_detections, dtype=np.int64)
+        predicted = self.predict(timestamp)
+
+        matched_tracks = np.zeros(0, dtype=np.intp)
+        matched_detections = np.zeros(0, dtype=np.intp)
+        if predicted is not None and num_detections:
+            cost = self.cost_function(self._match_view(predicted), self._match_view(states), self.max_cost)
+            matched_tracks, matched_detections = linear_assignment(cost, self.max_cost)
+
+        if predicted is not None:
+            dt = timestamp - self.last_timestamp
+            observed = states[matched_detections]
+            if dt > 0:
+                velocity = (observed - self.arrays[self.state_key][matched_tracks]) / dt
+                self.velocities[matched_tracks] = (
+                    self.velocity_smoothing * self.velocities[matched_tracks]
+                    + (1.0 - self.velocity_smoothing) * velocity
+                )
+            # unmatched tracks coast along their prediction
+            self.arrays[self.state_key] = predicted
+            for key, values in arrays.items():
+                self.arrays[key][matched_tracks] = values[matched_detections]
+            self.missed += 1
+            self.missed[matched_tracks] = 0
+            detection_ids[matched_detections] = self.ids[matched_tracks]
+
+        new_detections = np.setdiff1d(np.arange(num_detections), matched_detections)
+        if len(new_detections):
+            new_ids = np.arange(self.next_id, self.next_id + len(new_detections), dtype=np.int64)
+            self.next_id += len(new_detections)
+            detection_ids[new_detections] = new_ids
+            self._add_tracks(new_ids, {key: values[new_detections] for key, values in arrays.items()})
+
+        alive = self.missed <= self.max_missed
+        if not alive.all():
+            self._keep(alive)
+        self.last_timestamp = timestamp
+        return detection_ids
+
+    def _match_view(self, states):
+        # a compact contiguous copy of the anchor landmarks keeps the pairwise comparison small
+        if self.anchors is None:
+            return states
+        return np.ascontiguousarray(states[:, self.anchors, :2])
+
+    def coast(self, timestamp):
+        # arrays and IDs of every live track moved to the given time, for frames without fresh inference
+        predicted = self.predict(timestamp)
+        if predicted is None:
+            return None, self.ids
+        arrays = dict(self.arrays)
+        arrays[self.state_key] = predicted
+        return arrays, self.ids
+
+    def _add_tracks(self, ids, arrays):
+        velocities = np.zeros_like(arrays[self.state_key])
+        if self.arrays is None or not len(self):
+            self.arrays = {key: values.copy() for key, values in arrays.items()}
+            self.velocities = velocities
+            self.ids = ids
+            self.missed = np.zeros(len(ids), dtype=np.int32)
+            return
+        self.arrays = {key: np.concatenate([self.arrays[key], arrays[key]]) for key in self.arrays}
+        self.velocities = np.concatenate([self.velocities, velocities])
+        self.ids = np.concatenate([self.ids, ids])
+        self.missed = np.concatenate([self.missed, np.zeros(len(ids), dtype=np.int32)])
+
+    def _keep(self, mask):
+        self.arrays = {key: values[mask] for key, values in self.arrays.items()}
+        self.velocities = self.velocities[mask]
+        self.ids = self.ids[mask]
+        self.missed = self.missed[mask]
+
+def track_anchors(arrays, state_key, frame_size):
+    # pixel position for each object's ID label: box corner, or the first landmark (wrist / nose)
+    height, width = frame_size
+    if state_key == "boxes":
+        return arrays["boxes"][:, :2].astype(np.int32)
+    return (arrays["landmarks"][:, 0, :2] * (width, height)).astype(np.int32)
+
+def draw_track_ids(frame, anchors, ids, label_config):
+    return draw_text_labels(frame, anchors, [f"#{track_id}" for track_id in ids.tolist()], label_config)
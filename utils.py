@@ -1,27 +1,58 @@
 import cv2
-import mediapipe as mp
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
+import numpy as np
 import os
-from typing import List, Tuple, Optional, Any
+from types import SimpleNamespace
+from typing import List, Tuple, Optional, Any, Callable
+
+# mediapipe is imported on first use: its task stack is by far the slowest import at startup
+RUNNING_MODES = {
+    "image": "IMAGE",
+    "video": "VIDEO",
+    "live_stream": "LIVE_STREAM"
+}
+_mediapipe = None
+
+def get_mediapipe() -> Any:
+    global _mediapipe
+    if _mediapipe is None:
+        import mediapipe
+        _mediapipe = mediapipe
+    return _mediapipe
 
 def load_mediapipe_model(
     model_path: str,
     task_type: str,
+    running_mode: str = "image",
+    result_callback: Optional[Callable] = None,
     **kwargs
 ) -> Optional[Any]:
     if not os.path.exists(model_path):
         print(f"[Utils Error] Model isn't exists: {model_path}")
         return None
 
+    if running_mode not in RUNNING_MODES:
+        print(f"[Utils Error] Unsupported running mode: {running_mode}")
+        return None
+
+    if running_mode == "live_stream" and result_callback is None:
+        print("[Utils Error] live_stream running mode requires a result callback")
+        return None
+
     try:
+        from mediapipe.tasks import python
+        from mediapipe.tasks.python import vision
+
         base_options = python.BaseOptions(model_asset_path=model_path)
+        mode_options = {"running_mode": getattr(vision.RunningMode, RUNNING_MODES[running_mode])}
+        if running_mode == "live_stream":
+            mode_options["result_callback"] = result_callback
         
         if task_type == "face_detector":
             min_detection_confidence = kwargs.get("min_detection_confidence", 0.5)
             options = vision.FaceDetectorOptions(
                 base_options=base_options,
-                min_detection_confidence=min_detection_confidence
+                min_detection_confidence=min_detection_confidence,
+                **mode_options
             )
             detector = vision.FaceDetector.create_from_options(options)
         
@@ -36,7 +67,8 @@ def load_mediapipe_model(
                 num_hands=num_hands,
                 min_hand_detection_confidence=min_detection_conf,
                 min_hand_presence_confidence=min_presence_conf,
-                min_tracking_confidence=min_tracking_conf
+                min_tracking_confidence=min_tracking_conf,
+                **mode_options
             )
             detector = vision.HandLandmarker.create_from_options(options)
         
@@ -52,7 +84,8 @@ def load_mediapipe_model(
                 min_pose_detection_confidence=min_detection_conf,
                 min_pose_presence_confidence=min_presence_conf,
                 min_tracking_confidence=min_tracking_conf,
-                output_segmentation_masks=False
+                output_segmentation_masks=False,
+                **mode_options
             )
             detector = vision.PoseLandmarker.create_from_options(options)
         
@@ -60,71 +93,80 @@ def load_mediapipe_model(
             print(f"[Utils Error] Unsupported task types: {task_type}")
             return None
         
-        print(f"[Utils Info] {task_type} Loading success")
+        print(f"[Utils Info] {task_type} ({running_mode}) Loading success")
         return detector
     
     except Exception as e:
         print(f"[Utils Error] Loading fail: {str(e)}")
         return None
 
-def convert_bgr_to_mp_image(frame: cv2.Mat) -> Optional[mp.Image]:
+def run_mediapipe_detection(
+    detector: Any,
+    mp_image: Any,
+    running_mode: str = "image",
+    timestamp_ms: int = 0
+) -> Optional[Any]:
+    if running_mode == "video":
+        return detector.detect_for_video(mp_image, timestamp_ms)
+    if running_mode == "live_stream":
+        # the result arrives later through the result callback
+        detector.detect_async(mp_image, timestamp_ms)
+        return None
+    return detector.detect(mp_image)
+
+def convert_bgr_to_mp_image(frame: cv2.Mat, dst: Optional[np.ndarray] = None) -> Optional[Any]:
     if frame is None:
         return None
     try:
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        mp = get_mediapipe()
+        # mp.Image copies the pixels, so dst can be reused as soon as this returns
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=dst)
         return mp.Image(image_format=mp.ImageFormat.SRGB, data=frame_rgb)
     except Exception as e:
         print(f"[Utils Error] Image format conversion recognition failed: {str(e)}")
         return None
 
-def flip_frame(frame: cv2.Mat) -> cv2.Mat:
+def flip_frame(frame: cv2.Mat, dst: Optional[np.ndarray] = None) -> cv2.Mat:
     if frame is None:
         return frame
-    return cv2.flip(frame, 1)
+    return cv2.flip(frame, 1, dst=dst)
+
+def landmarks_to_pixels(landmarks: List[Any], frame_size: Tuple[int, int]) -> np.ndarray:
+    frame_height, frame_width = frame_size
+    points = np.array([(landmark.x, landmark.y) for landmark in landmarks], dtype=np.float32).reshape(-1, 2)
+    points *= (frame_width, frame_height)
+    return points.astype(np.int32)
 
 def draw_landmark_points(
     frame: cv2.Mat,
-    landmarks: List[Any],
-    frame_size: Tuple[int, int],
+    points: np.ndarray,
     circle_radius: int = 5,
     circle_color: Tuple[int, int, int] = (255, 0, 0)
 ) -> cv2.Mat:
-    if frame is None or not landmarks:
+    if frame is None or points is None or len(points) == 0:
         return frame
     
-    frame_height, frame_width = frame_size
-    for landmark in landmarks:
-        x = int(landmark.x * frame_width)
-        y = int(landmark.y * frame_height)
+    # OpenCV has no batched circle call, but iterating a plain int list avoids per-point numpy scalars
+    for x, y in points.tolist():
         cv2.circle(frame, (x, y), circle_radius, circle_color, -1)
     return frame
 
 def draw_landmark_connections(
     frame: cv2.Mat,
-    landmarks: List[Any],
-    connections: List[Tuple[int, int]],
-    frame_size: Tuple[int, int],
+    points: np.ndarray,
+    connections: np.ndarray,
     line_thickness: int = 2,
     line_color: Tuple[int, int, int] = (0, 255, 0)
 ) -> cv2.Mat:
-    if frame is None or not landmarks or not connections:
+    if frame is None or points is None or len(points) == 0 or len(connections) == 0:
         return frame
     
-    frame_height, frame_width = frame_size
-    for connection in connections:
-        start_idx, end_idx = connection
-        if start_idx >= len(landmarks) or end_idx >= len(landmarks):
-            continue
-        
-        start_landmark = landmarks[start_idx]
-        end_landmark = landmarks[end_idx]
-        
-        start_x = int(start_landmark.x * frame_width)
-        start_y = int(start_landmark.y * frame_height)
-        end_x = int(end_landmark.x * frame_width)
-        end_y = int(end_landmark.y * frame_height)
-        
-        cv2.line(frame, (start_x, start_y), (end_x, end_y), line_color, line_thickness)
+    if connections.max() >= len(points):
+        connections = connections[(connections < len(points)).all(axis=1)]
+    
+    # (M, 2, 2) segments drawn as open two-point polylines in one call
+    segments = points[connections]
+    cv2.polylines(frame, segments, False, line_color, line_thickness)
     return frame
 
 def draw_bounding_box(
@@ -153,7 +195,113 @@ def draw_bounding_box(
             (x1, y1 + label_config["offset_y"]),
             label_config["font"],
             label_config["scale"],
-            tuple(label_config["color"]),
+            label_config["color"],
+            label_config["thickness"]
+        )
+    return frame
+
+def draw_text_labels(
+    frame: cv2.Mat,
+    anchors: np.ndarray,
+    labels: List[str],
+    label_config: dict
+) -> cv2.Mat:
+    for (x, y), label in zip(anchors.tolist(), labels):
+        if not label:
+            continue
+        cv2.putText(
+            frame,
+            label,
+            (x, y + label_config["offset_y"]),
+            label_config["font"],
+            label_config["scale"],
+            label_config["color"],
             label_config["thickness"]
         )
-    return frame
\ No newline at end of file
+    return frame
+
+def detections_to_arrays(detections: List[Any]) -> dict:
+    boxes = np.zeros((len(detections), 4), dtype=np.float32)
+    scores = np.zeros(len(detections), dtype=np.float32)
+    for i, detection in enumerate(detections):
+        bbox = detection.bounding_box
+        boxes[i] = (bbox.origin_x, bbox.origin_y, bbox.width, bbox.height)
+        scores[i] = detection.categories[0].score if detection.categories else 0.0
+    return {"boxes": boxes, "scores": scores}
+
+def landmark_lists_to_array(landmark_lists: List[List[Any]], num_landmarks: int) -> np.ndarray:
+    landmarks = np.zeros((len(landmark_lists), num_landmarks, 3), dtype=np.float32)
+    for i, landmark_list in enumerate(landmark_lists):
+        count = min(len(landmark_list), num_landmarks)
+        if count:
+            landmarks[i, :count] = [(lm.x, lm.y, lm.z) for lm in landmark_list[:count]]
+    return landmarks
+
+def remap_landmark_lists(
+    landmark_lists: List[List[Any]],
+    roi: Tuple[int, int, int, int],
+    frame_size: Tuple[int, int]
+) -> None:
+    # landmarks normalized to the roi image -> normalized to the full frame, in place
+    frame_height, frame_width = frame_size
+    x0, y0, x1, y1 = roi
+    if (x0, y0, x1, y1) == (0, 0, frame_width, frame_height):
+        return
+    scale_x = (x1 - x0) / frame_width
+    scale_y = (y1 - y0) / frame_height
+    offset_x = x0 / frame_width
+    offset_y = y0 / frame_height
+    for landmarks in landmark_lists:
+        for landmark in landmarks:
+            landmark.x = offset_x + landmark.x * scale_x
+            landmark.y = offset_y + landmark.y * scale_y
+            landmark.z = landmark.z * scale_x
+
+def remap_detections(
+    detections: List[Any],
+    roi: Tuple[int, int, int, int],
+    input_size: Tuple[int, int],
+    frame_size: Tuple[int, int]
+) -> None:
+    # pixel boxes / normalized keypoints of an input_size (width, height) image covering roi -> full frame, in place
+    frame_height, frame_width = frame_size
+    input_width, input_height = input_size
+    x0, y0, x1, y1 = roi
+    scale_x = (x1 - x0) / input_width
+    scale_y = (y1 - y0) / input_height
+    for detection in detections:
+        bbox = detection.bounding_box
+        bbox.origin_x = int(round(x0 + bbox.origin_x * scale_x))
+        bbox.origin_y = int(round(y0 + bbox.origin_y * scale_y))
+        bbox.width = int(round(bbox.width * scale_x))
+        bbox.height = int(round(bbox.height * scale_y))
+        for keypoint in detection.keypoints or []:
+            keypoint.x = (x0 + keypoint.x * (x1 - x0)) / frame_width
+            keypoint.y = (y0 + keypoint.y * (y1 - y0)) / frame_height
+
+def merge_results(results: List[Any], list_fields: Tuple[str, ...]) -> Optional[Any]:
+    results = [result for result in results if result is not None]
+    if not results:
+        return None
+    merged = results[0]
+    for result in results[1:]:
+        for field in list_fields:
+            getattr(merged, field).extend(getattr(result, field))
+    return merged
+
+def arrays_to_detections(boxes: np.ndarray, scores: np.ndarray) -> List[Any]:
+    # lightweight stand-ins with the attributes draw/remap/to_arrays read from MediaPipe detections
+    return [
+        SimpleNamespace(
+            bounding_box=SimpleNamespace(origin_x=int(x), origin_y=int(y), width=int(w), height=int(h)),
+            categories=[SimpleNamespace(score=float(score))],
+            keypoints=[]
+        )
+        for (x, y, w, h), score in zip(boxes.tolist(), scores.tolist())
+    ]
+
+def array_to_landmark_lists(landmarks: np.ndarray) -> List[List[Any]]:
+    return [
+        [SimpleNamespace(x=x, y=y, z=z, visibility=None) for x, y, z in landmark_list]
+        for landmark_list in landmarks.tolist()
+    ]
\ No newline at end of file